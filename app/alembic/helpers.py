@@ -0,0 +1,31 @@
+from alembic import op
+from sqlalchemy import Index, func, text
+
+from app.models.search_filter_mixin import text_search_config
+from app.models.types import TEXT_SEARCH_CONFIG
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN index serving `SearchMode.trigram` and `SearchMode.ilike` filters, to use in `__table_args__`."""
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+def full_text_index(name: str, column: str, config: str = TEXT_SEARCH_CONFIG) -> Index:
+    """GIN index serving `SearchMode.full_text` filters, to use in `__table_args__`."""
+    return Index(name, func.to_tsvector(text_search_config(config), text(column)), postgresql_using="gin")
+
+
+def create_trigram_extension():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+def create_trigram_index(name: str, table: str, column: str):
+    op.create_index(name, table, [column], postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+def create_full_text_index(name: str, table: str, column: str, config: str = TEXT_SEARCH_CONFIG):
+    op.create_index(name, table, [text(f"to_tsvector('{config}'::regconfig, {column})")], postgresql_using="gin")
+
+
+def drop_search_index(name: str, table: str):
+    op.drop_index(name, table_name=table)
@@ -1,3 +1,6 @@
-from app.core.config import _Config
+from app.startup import startup_phase
 
-ms_config = _Config()
+with startup_phase("config"):
+    from app.core.config import _Config
+
+    ms_config = _Config()
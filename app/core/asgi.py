@@ -0,0 +1,213 @@
+import re
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import DEFAULT_CORRELATION_ID, ctx_correlation_id, ctx_step, log_context, logger
+from app.core.request_metrics import request_metrics_context
+from app.repositories.base_sql_repository import request_routing_scope
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = {"Accept", "Accept-Language", "Content-Language", "Content-Type"}
+
+
+@dataclass
+class _RequestHeaders:
+    origin: Optional[str] = None
+    correlation_id: Optional[str] = None
+    step: Optional[str] = None
+    has_cookie: bool = False
+    preflight_method: Optional[str] = None
+    preflight_headers: Optional[str] = None
+
+
+def _read_headers(raw_headers: RawHeaders) -> _RequestHeaders:
+    headers = _RequestHeaders()
+    for name, value in raw_headers:
+        if name == b"origin":
+            headers.origin = value.decode("latin-1")
+        elif name == b"correlation_id":
+            headers.correlation_id = value.decode("latin-1")
+        elif name == b"step":
+            headers.step = value.decode("latin-1")
+        elif name == b"cookie":
+            headers.has_cookie = True
+        elif name == b"access-control-request-method":
+            headers.preflight_method = value.decode("latin-1")
+        elif name == b"access-control-request-headers":
+            headers.preflight_headers = value.decode("latin-1")
+    return headers
+
+
+def _encode(headers: Dict[str, str]) -> RawHeaders:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+def _allow_explicit_origin(headers: RawHeaders, origin: str):
+    headers[:] = [(name, value) for name, value in headers if name != b"access-control-allow-origin"]
+    headers.append((b"access-control-allow-origin", origin.encode("latin-1")))
+    for index, (name, value) in enumerate(headers):
+        if name == b"vary":
+            headers[index] = (name, value + b", Origin")
+            return
+    headers.append((b"vary", b"Origin"))
+
+
+class RequestPipelineMiddleware:
+    """Path rewrites, CORS, logging context and request metrics in one pure ASGI middleware.
+
+    The CORS behaviour follows starlette's CORSMiddleware, with the header blocks computed once here."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_rewrites: Dict[str, str],
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        allow_origin_regex: Optional[str] = None,
+        expose_headers: Sequence[str] = (),
+        max_age: int = 600,
+        quiet_paths: Sequence[str] = (),
+    ):
+        self.app = app
+        self.path_rewrites = {path: (target, target.encode("latin-1")) for path, target in path_rewrites.items()}
+        self.quiet_paths = frozenset(quiet_paths)
+
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+        self.allow_methods: FrozenSet[str] = frozenset(allow_methods)
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_origins: FrozenSet[str] = frozenset(allow_origins)
+        self.allow_origin_regex = re.compile(allow_origin_regex) if allow_origin_regex is not None else None
+        self.preflight_explicit_allow_origin = not self.allow_all_origins or allow_credentials
+
+        simple_headers: Dict[str, str] = {}
+        if self.allow_all_origins:
+            simple_headers["Access-Control-Allow-Origin"] = "*"
+        if allow_credentials:
+            simple_headers["Access-Control-Allow-Credentials"] = "true"
+        if expose_headers:
+            simple_headers["Access-Control-Expose-Headers"] = ", ".join(expose_headers)
+        self.simple_headers = _encode(simple_headers)
+        self.simple_header_names = frozenset(name for name, _ in self.simple_headers)
+
+        preflight_headers: Dict[str, str] = {}
+        if self.preflight_explicit_allow_origin:
+            preflight_headers["Vary"] = "Origin"
+        else:
+            preflight_headers["Access-Control-Allow-Origin"] = "*"
+        preflight_headers["Access-Control-Allow-Methods"] = ", ".join(allow_methods)
+        preflight_headers["Access-Control-Max-Age"] = str(max_age)
+        sorted_allow_headers = sorted(SAFELISTED_HEADERS | set(allow_headers))
+        if sorted_allow_headers and not self.allow_all_headers:
+            preflight_headers["Access-Control-Allow-Headers"] = ", ".join(sorted_allow_headers)
+        if allow_credentials:
+            preflight_headers["Access-Control-Allow-Credentials"] = "true"
+        self.preflight_headers = preflight_headers
+        self.allow_headers: FrozenSet[str] = frozenset(header.lower() for header in sorted_allow_headers)
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins or origin in self.allow_origins:
+            return True
+        return self.allow_origin_regex is not None and self.allow_origin_regex.fullmatch(origin) is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        rewrite = self.path_rewrites.get(scope.get("path", ""))
+        if rewrite is not None:
+            scope["path"], scope["raw_path"] = rewrite
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = _read_headers(scope["headers"])
+        step = int(headers.step or 0)
+        with (
+            log_context(headers.correlation_id or DEFAULT_CORRELATION_ID, step),
+            request_routing_scope(),
+            request_metrics_context() as metrics,
+        ):
+            started = perf_counter()
+            status_code = 500
+            preflight = (
+                headers.origin is not None and scope["method"] == "OPTIONS" and headers.preflight_method is not None
+            )
+
+            async def send_with_headers(message: Message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    response_headers: RawHeaders = list(message.get("headers", []))
+                    if headers.origin is not None and not preflight:
+                        self._add_cors_headers(response_headers, headers)
+                    response_headers.append((b"correlation_id", ctx_correlation_id.get().encode("latin-1")))
+                    response_headers.append((b"step", str(ctx_step.get()).encode("latin-1")))
+                    server_timing = metrics.server_timing(perf_counter() - started)
+                    response_headers.append((b"server-timing", server_timing.encode("latin-1")))
+                    message["headers"] = response_headers
+                await send(message)
+
+            try:
+                if preflight:
+                    await self._preflight_response(headers, send_with_headers)
+                else:
+                    await self.app(scope, receive, send_with_headers)
+            finally:
+                if scope["path"] not in self.quiet_paths:
+                    logger.info(
+                        "request completed",
+                        extra={
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status_code": status_code,
+                            **metrics.as_log_fields(perf_counter() - started),
+                        },
+                    )
+
+    def _add_cors_headers(self, response_headers: RawHeaders, headers: _RequestHeaders):
+        origin = headers.origin or ""
+        if self.simple_headers:
+            response_headers[:] = [
+                (name, value) for name, value in response_headers if name not in self.simple_header_names
+            ]
+            response_headers.extend(self.simple_headers)
+        # A request with cookies needs the explicit origin, never '*'.
+        if self.allow_all_origins and headers.has_cookie:
+            _allow_explicit_origin(response_headers, origin)
+        elif not self.allow_all_origins and self.is_allowed_origin(origin):
+            _allow_explicit_origin(response_headers, origin)
+
+    async def _preflight_response(self, headers: _RequestHeaders, send: Send):
+        origin = headers.origin or ""
+        response_headers = dict(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            if self.preflight_explicit_allow_origin:
+                response_headers["Access-Control-Allow-Origin"] = origin
+        else:
+            failures.append("origin")
+
+        if headers.preflight_method not in self.allow_methods:
+            failures.append("method")
+
+        if self.allow_all_headers and headers.preflight_headers is not None:
+            response_headers["Access-Control-Allow-Headers"] = headers.preflight_headers
+        elif headers.preflight_headers is not None:
+            for header in headers.preflight_headers.lower().split(","):
+                if header.strip() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        body = b"Disallowed CORS " + ", ".join(failures).encode("latin-1") if failures else b"OK"
+        raw_headers = _encode(response_headers)
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        raw_headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        await send({"type": "http.response.start", "status": 400 if failures else 200, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
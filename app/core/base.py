@@ -30,6 +30,13 @@ class Database(BaseModel, validate_default=True):
     database: StrictStr
     user: StrictStr
     password: StrictStr
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = -1
+    pool_timeout: float = 30
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
 
     def uri(self, scheme: StrictStr) -> str:
         uri = f"{scheme}://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
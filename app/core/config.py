@@ -1,13 +1,34 @@
 import base64
 import os
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, HttpUrl, StrictInt, StrictStr, TypeAdapter, field_validator
 
 from app.core.base import BaseConfig, Database
 
 
+def _database_pool_settings() -> Dict[str, str]:
+    variables = {
+        "pool_size": "DATABASE_POOL_SIZE",
+        "max_overflow": "DATABASE_MAX_OVERFLOW",
+        "pool_recycle": "DATABASE_POOL_RECYCLE",
+        "pool_timeout": "DATABASE_POOL_TIMEOUT",
+        "pool_pre_ping": "DATABASE_POOL_PRE_PING",
+        "statement_cache_size": "DATABASE_STATEMENT_CACHE_SIZE",
+        "prepared_statement_cache_size": "DATABASE_PREPARED_STATEMENT_CACHE_SIZE",
+    }
+    return {name: os.environ[variable] for name, variable in variables.items() if variable in os.environ}
+
+
+def _database_read_replicas(primary: Database) -> List[Database]:
+    replicas = []
+    for address in filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")):
+        host, _, port = address.strip().partition(":")
+        replicas.append(primary.model_copy(update={"host": host, "port": int(port) if port else primary.port}))
+    return replicas
+
+
 class _Cookies(BaseModel, validate_default=True):
     max_session_duration: timedelta = timedelta(days=90)
     refresh_token_duration: timedelta = timedelta(days=30)
@@ -30,6 +51,48 @@ class _JwtToken(BaseModel, validate_default=True):
         return base64.b64decode(data.replace("\\n", "\n")).decode("utf-8").replace("\\n", "\n")
 
 
+class _GraphQL(BaseModel, validate_default=True):
+    document_cache_size: StrictInt = 512
+    persisted_queries_cache_size: StrictInt = 2048
+    max_query_cost: StrictInt = 5000
+    # Introspection counts too: graphql-core's standard introspection query is 15 levels deep.
+    max_query_depth: StrictInt = 15
+    max_query_fields: StrictInt = 1000
+    default_connection_size: StrictInt = 20
+
+
+class _Passwords(BaseModel, validate_default=True):
+    bcrypt_rounds: StrictInt = 12
+    hashing_processes: StrictInt = 2
+    max_concurrent_hashes: StrictInt = 2
+
+
+class _GraphQLGateway(BaseModel, validate_default=True):
+    max_connections: StrictInt = 100
+    max_keepalive_connections: StrictInt = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 10.0
+    http2: bool = True
+    batching: bool = False
+    batch_window_seconds: float = 0.002
+    max_batch_size: StrictInt = 20
+    response_cache_size: StrictInt = 1024
+
+
+class _Metrics(BaseModel, validate_default=True):
+    graphql_sample_rate: float = 0.1
+    # Shared by the uvicorn workers so /metrics can sum their snapshots.
+    multiprocess_directory: Optional[StrictStr] = os.environ.get("METRICS_MULTIPROCESS_DIR")
+    flush_interval_seconds: float = 5.0
+    # Operations named after this many distinct ones are counted under a single "other" label.
+    max_operation_labels: StrictInt = 200
+
+
+class _Readiness(BaseModel, validate_default=True):
+    interval_seconds: float = 5.0
+    timeout_seconds: float = 2.0
+
+
 class _Config(BaseConfig):
     database: Database = Database(
         host=os.environ["DATABASE_HOST"],
@@ -37,9 +100,16 @@ class _Config(BaseConfig):
         database=os.environ["DATABASE_NAME"],
         user=os.environ["DATABASE_USER"],
         password=os.environ["DATABASE_PASSWORD"],
+        **_database_pool_settings(),  # pyright: ignore [reportArgumentType]
     )
+    read_replicas: List[Database] = _database_read_replicas(database)
     graphql_gateway_url: str = str(TypeAdapter(HttpUrl).validate_python(os.environ["GRAPHQL_GATEWAY_URL"]))  # type: ignore # see: https://github.com/microsoft/pyright/discussions/7091
     web_application_url: str = str(TypeAdapter(HttpUrl).validate_python(os.environ["WEB_APPLICATION_URL"]))  # type: ignore # see: https://github.com/microsoft/pyright/discussions/7091
     cookies: _Cookies = _Cookies()
     jwt: _JwtToken = _JwtToken()
+    graphql: _GraphQL = _GraphQL()
+    graphql_gateway: _GraphQLGateway = _GraphQLGateway()
+    passwords: _Passwords = _Passwords()
+    metrics: _Metrics = _Metrics()
+    readiness: _Readiness = _Readiness()
     reset_password_token_expires_after: int = 900
@@ -3,6 +3,8 @@ from typing import Dict, Optional
 from ariadne.types import ContextValue
 from starlette.requests import Request
 
+from app.core.dataloader import LoaderRegistry
+
 
 async def get_context_value(request: Request, data: Optional[Dict] = None) -> ContextValue:
-    return {"request": request, "data": data}
+    return {"request": request, "data": data, "loaders": LoaderRegistry()}
@@ -0,0 +1,122 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from app.models.base_model import Base
+from app.repositories.base_sql_repository import SqlBaseRepository, session_ctx
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T", bound=Base)
+
+
+@dataclass
+class DataLoader(Generic[K, V]):
+    batch_load: Callable[[List[K]], Awaitable[Sequence[V]]]
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    max_batch_size: int = 500
+    _cache: Dict[K, "asyncio.Future[V]"] = field(default_factory=dict, init=False)
+    _queue: List[Tuple[K, "asyncio.Future[V]"]] = field(default_factory=list, init=False)
+    _tasks: Set["asyncio.Future[None]"] = field(default_factory=set, init=False)
+
+    def load(self, key: K) -> "asyncio.Future[V]":
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._queue:
+                # Every load issued before the loop gets back to this callback joins the same batch.
+                loop.call_soon(self._dispatch)
+            self._queue.append((key, future))
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V):
+        if key not in self._cache:
+            future = self._cache[key] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+
+    def clear(self, key: K):
+        self._cache.pop(key, None)
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            task = asyncio.ensure_future(self._load_batch(queue[start : start + self.max_batch_size]))
+            # The event loop only keeps weak references to tasks.
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: List[Tuple[K, "asyncio.Future[V]"]]):
+        keys = [key for key, _ in batch]
+        try:
+            if session_ctx.get(None) is None:
+                values = await self.batch_load(keys)
+            else:
+                # Batches share the request session inside a transaction, so they must not overlap.
+                async with self.lock:
+                    values = await self.batch_load(keys)
+            if len(values) != len(keys):
+                raise ValueError(f"Batch load returned {len(values)} values for {len(keys)} keys.")
+        except Exception as exc:
+            for key, future in batch:
+                self._cache.pop(key, None)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), value in zip(batch, values):
+            if not future.done():
+                future.set_result(value)
+
+
+@dataclass
+class LoaderRegistry:
+    _loaders: Dict[Hashable, DataLoader] = field(default_factory=dict, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    def get(self, key: Hashable, batch_load: Callable[[List[Any]], Awaitable[Sequence[Any]]]) -> DataLoader:
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = DataLoader(batch_load, lock=self._lock)
+        return loader
+
+    def model_loader(
+        self, repository: SqlBaseRepository, class_name: Type[T], column: str = "id"
+    ) -> DataLoader[Any, Optional[T]]:
+        async def batch_load(keys: List[Any]) -> List[Optional[T]]:
+            models = await repository.get_by_ids(class_name, keys, column)
+            by_key = {getattr(model, column): model for model in models}
+            return [by_key.get(key) for key in keys]
+
+        # The loader keeps the repository alive, so its id cannot be reused while the key is registered.
+        return self.get((id(repository), class_name, column, False), batch_load)
+
+    def model_list_loader(
+        self, repository: SqlBaseRepository, class_name: Type[T], column: str
+    ) -> DataLoader[Any, List[T]]:
+        async def batch_load(keys: List[Any]) -> List[List[T]]:
+            models = await repository.get_by_ids(class_name, keys, column)
+            by_key: Dict[Any, List[T]] = {}
+            for model in models:
+                by_key.setdefault(getattr(model, column), []).append(model)
+            return [by_key.get(key, []) for key in keys]
+
+        return self.get((id(repository), class_name, column, True), batch_load)
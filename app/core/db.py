@@ -6,7 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.core import ms_config
 from app.core.config import BaseConfig, Database
+from app.core.pool import InstrumentedAsyncQueuePool
+from app.core.request_metrics import instrument_engine
+from app.repositories.base_sql_repository import register_read_replicas
 from app.repositories.base_sql_repository import transaction as base_transaction
+from app.startup import startup_phase
 
 
 def create_engine(database: Database, config: BaseConfig) -> Tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
@@ -19,15 +23,28 @@ def create_engine(database: Database, config: BaseConfig) -> Tuple[AsyncEngine,
             port=database.port,
             database=database.database,
         ),
-        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=database.pool_size,
+        max_overflow=database.max_overflow,
+        pool_recycle=database.pool_recycle,
+        pool_timeout=database.pool_timeout,
+        pool_pre_ping=database.pool_pre_ping,
+        connect_args={
+            "statement_cache_size": database.statement_cache_size,
+            "prepared_statement_cache_size": database.prepared_statement_cache_size,
+        },
         echo=config.is_dev_environment(),
     )
+    instrument_engine(engine)
     Session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
     return engine, Session
 
 
-engine, Session = create_engine(ms_config.database, ms_config)
+with startup_phase("engine"):
+    engine, Session = create_engine(ms_config.database, ms_config)
+    replicas = [create_engine(replica, ms_config) for replica in ms_config.read_replicas]
+    register_read_replicas(Session, [replica_session for _, replica_session in replicas])
 
 
 @dataclass
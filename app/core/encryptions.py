@@ -1,11 +1,79 @@
+import asyncio
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import jwt
 from passlib.hash import bcrypt
 
 from app.core import ms_config
+from app.core.exceptions import UnauthorizedError
+from app.core.metrics import Gauge
+from app.startup import on_shutdown
+
+
+@dataclass
+class JwtService:
+    private_key: str
+    public_key: str
+    algorithm: str
+    issuer: str
+    cache_size: int = 1024
+    _verified: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = field(default_factory=OrderedDict, init=False)
+
+    def __post_init__(self):
+        # PyJWT parses PEM strings on every call, key objects are parsed once here.
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        self._signing_key = algorithm.prepare_key(self.private_key)
+        self._verifying_key = algorithm.prepare_key(self.public_key)
+
+    def sign(self, data: dict) -> str:
+        return jwt.encode(data, self._signing_key, algorithm=self.algorithm)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        entry = self._verified.get(token)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > time.time():
+                self._verified.move_to_end(token)
+                return dict(payload)
+            del self._verified[token]
+
+        try:
+            payload = jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                issuer=self.issuer,
+                options={"require": ["exp"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise UnauthorizedError() from exc
+
+        self._verified[token] = (float(payload["exp"]), payload)
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return dict(payload)
+
+
+@cache
+def get_jwt_service() -> JwtService:
+    # Parsing the RSA keys is slow, so it happens on first use rather than on import.
+    return JwtService(
+        private_key=ms_config.jwt.auth_private_key,
+        public_key=ms_config.jwt.auth_public_key,
+        algorithm=ms_config.jwt.algorithm,
+        issuer=ms_config.jwt.issuer,
+    )
 
 
 def sign_jwt_dict(data: dict) -> str:
-    return jwt.encode(data, ms_config.jwt.auth_private_key, algorithm=ms_config.jwt.algorithm)
+    return get_jwt_service().sign(data)
 
 
 def hash_password(password: str, rounds=12) -> str:
@@ -14,3 +82,86 @@ def hash_password(password: str, rounds=12) -> str:
 
 def verify_password(password: str, hash: str) -> bool:
     return bcrypt.verify(password, hash)
+
+
+def verify_and_update_password(password: str, hash: str, rounds=12) -> Tuple[bool, Optional[str]]:
+    if not bcrypt.verify(password, hash):
+        return False, None
+    if bcrypt.from_string(hash).rounds != rounds:
+        return True, hash_password(password, rounds)
+    return True, None
+
+
+@dataclass
+class PasswordHashingStatistics:
+    calls: int = 0
+    waiting: int = 0
+    queue_seconds_total: float = 0.0
+    queue_seconds_max: float = 0.0
+
+
+password_hashing_statistics = PasswordHashingStatistics()
+_executor: Optional[ProcessPoolExecutor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+async def _run_in_process(func: Callable[..., Any], *args: Any) -> Any:
+    global _executor, _semaphore
+    if _executor is None:
+        # Forked workers would inherit the event loop, the engine's sockets and held locks.
+        _executor = ProcessPoolExecutor(
+            max_workers=ms_config.passwords.hashing_processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        on_shutdown(shutdown_password_executor)
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(ms_config.passwords.max_concurrent_hashes)
+
+    statistics = password_hashing_statistics
+    statistics.waiting += 1
+    start = perf_counter()
+    try:
+        await _semaphore.acquire()
+    finally:
+        statistics.waiting -= 1
+    try:
+        waited = perf_counter() - start
+        statistics.calls += 1
+        statistics.queue_seconds_total += waited
+        statistics.queue_seconds_max = max(statistics.queue_seconds_max, waited)
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _semaphore.release()
+
+
+async def hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+    return await _run_in_process(hash_password, password, rounds or ms_config.passwords.bcrypt_rounds)
+
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    return await _run_in_process(verify_password, password, hash)
+
+
+async def verify_and_update_password_async(
+    password: str, hash: str, rounds: Optional[int] = None
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether the password matches and, when the hash uses other rounds than configured, a new hash."""
+    return await _run_in_process(
+        verify_and_update_password, password, hash, rounds or ms_config.passwords.bcrypt_rounds
+    )
+
+
+def password_hashing_gauges() -> List[Gauge]:
+    statistics = password_hashing_statistics
+    return [
+        ("password_hashing_calls_total", "counter", {}, float(statistics.calls)),
+        ("password_hashing_waiting", "gauge", {}, float(statistics.waiting)),
+        ("password_hashing_queue_seconds_total", "counter", {}, statistics.queue_seconds_total),
+        ("password_hashing_queue_seconds_max", "gauge", {}, statistics.queue_seconds_max),
+    ]
+
+
+def shutdown_password_executor():
+    global _executor, _semaphore
+    executor, _executor, _semaphore = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
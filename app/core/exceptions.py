@@ -24,3 +24,7 @@ class AcknowledgeUploadError(Exception):
 
 class BadUserInputError(Exception):
     pass
+
+
+class PersistedQueryNotFoundError(Exception):
+    pass
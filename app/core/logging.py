@@ -1,13 +1,28 @@
+import atexit
 import contextvars
 import logging
+import queue
+import random
+import threading
+import zlib
+from collections import Counter
+from collections.abc import Mapping
 from contextlib import contextmanager
-from datetime import datetime
-from typing import Any, Dict, Optional
+from copy import copy
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from uuid import uuid4
 
+import orjson
 from pythonjsonlogger import json as jsonlogger
 
-ctx_correlation_id = contextvars.ContextVar("correlation_id", default="00000000-0000-4000-0000-000000000000")
+DEFAULT_CORRELATION_ID = "00000000-0000-4000-0000-000000000000"
+# Probe endpoints, neither the access log nor the request pipeline logs them.
+QUIET_PATHS = ("/health_check", "/health_check/ready")
+
+ctx_correlation_id = contextvars.ContextVar("correlation_id", default=DEFAULT_CORRELATION_ID)
 ctx_step = contextvars.ContextVar("step", default=0)
 custom_ctx: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
     "custom_logging_ctx", default=None
@@ -38,22 +53,145 @@ def log_context(correlation_id: str, step: int, custom: Optional[Dict[str, Any]]
     _reset_context(correlation_token, step_token, custom_token)
 
 
+def _capture_context() -> Tuple[str, int, Optional[Dict[str, Any]]]:
+    return ctx_correlation_id.get(), ctx_step.get(), custom_ctx.get()
+
+
 class Formatter(jsonlogger.JsonFormatter):
     def add_fields(self, log_record: Dict[str, Any], record: logging.LogRecord, message_dict: Dict[str, Any]):
         super().add_fields(log_record, record, message_dict)
+        # Records coming through a ContextQueueHandler carry the context of the thread that logged them.
+        correlation_id, step, custom = getattr(record, "_log_context", None) or _capture_context()
         log_record["level"] = record.levelname
-        log_record["timestamp"] = datetime.utcnow().isoformat()
-        log_record["correlation_id"] = ctx_correlation_id.get()
-        log_record["step"] = ctx_step.get()
-        log_record.update(custom_ctx.get() or {})
+        log_record["timestamp"] = datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat()
+        log_record["correlation_id"] = correlation_id
+        log_record["step"] = step
+        log_record.update(custom or {})
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of the records per level, deciding once per correlation id so a request is logged whole."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        levels = logging.getLevelNamesMapping()
+        self.rates = {levels[level.upper()]: rate for level, rate in rates.items()}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        correlation_id = ctx_correlation_id.get()
+        if correlation_id == DEFAULT_CORRELATION_ID:
+            return random.random() < rate
+        return zlib.crc32(correlation_id.encode()) < rate * 0xFFFFFFFF
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets `burst` records of the same call site and message through per `period`, counting the rest."""
+
+    def __init__(self, burst: int = 10, period: float = 60.0, max_keys: int = 10_000):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.max_keys = max_keys
+        self._windows: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Dict messages (merged into the JSON line) are unhashable, their call site alone is the key.
+        message = None if isinstance(record.msg, Mapping) else str(record.msg)
+        key = (record.name, record.levelno, record.pathname, record.lineno, message)
+        now = monotonic()
+        with self._lock:
+            started, count = self._windows.get(key, (now, 0))
+            if now - started >= self.period:
+                if count > self.burst:
+                    record.suppressed = count - self.burst
+                started, count = now, 0
+            if key not in self._windows and len(self._windows) >= self.max_keys:
+                self._windows.clear()
+            self._windows[key] = (started, count + 1)
+        return count < self.burst
+
+
+class AccessLogFilter(logging.Filter):
+    def __init__(self, excluded_paths: Iterable[str]):
+        super().__init__()
+        self.excluded_paths = frozenset(excluded_paths)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record_args = record.args
+        return isinstance(record_args, tuple) and len(record_args) >= 3 and record_args[2] not in self.excluded_paths
+
+
+_json_default = jsonlogger.JsonEncoder().default
+
+
+def _fast_json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> str:
+    # orjson has no indent/ensure_ascii variants, the formatter's other options are ignored.
+    return orjson.dumps(obj, default=default or _json_default).decode()
+
+
+class ContextQueueHandler(QueueHandler):
+    """Hands records to a bounded queue, dropping them instead of blocking the event loop when it is full."""
+
+    def __init__(
+        self, log_queue: "queue.Queue[logging.LogRecord]", block: bool = False, timeout: Optional[float] = None
+    ):
+        super().__init__(log_queue)
+        self.log_queue = log_queue
+        self.block = block
+        self.timeout = timeout
+        self.dropped: Counter[str] = Counter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener lives in the same process: keep exc_info for the JSON formatter, only freeze msg and args.
+        # A dict message stays a dict, the formatter merges it into the JSON line as in synchronous mode.
+        record = copy(record)
+        if isinstance(record.msg, Mapping):
+            record.msg = dict(record.msg)
+        elif record.args or not isinstance(record.msg, str):
+            record.msg = record.getMessage()
+            record.args = None
+        record._log_context = _capture_context()  # pyright: ignore [reportAttributeAccessIssue]
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.log_queue.put(record, block=self.block, timeout=self.timeout)
+        except queue.Full:
+            self.dropped[record.levelname] += 1
 
 
 def initialize_logger(
-    log_level: str = "INFO", logger_name: str = "default", formatter: Optional[Formatter] = None
+    log_level: str = "INFO",
+    logger_name: str = "default",
+    formatter: Optional[Formatter] = None,
+    asynchronous: bool = False,
+    queue_size: int = 10_000,
+    block: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limit: Optional[RateLimitFilter] = None,
 ) -> logging.Logger:
     _logger = logging.getLogger(logger_name)
+    # Logger filters run before any handler, so dropped records are never formatted or queued.
+    if sample_rates:
+        _logger.addFilter(SamplingFilter(sample_rates))
+    if rate_limit is not None:
+        _logger.addFilter(rate_limit)
     handler = logging.StreamHandler()
-    handler.setFormatter(formatter or Formatter())
-    _logger.addHandler(handler)
+    if asynchronous:
+        handler.setFormatter(formatter or Formatter(json_serializer=_fast_json_dumps))
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        _logger.addHandler(ContextQueueHandler(log_queue, block=block))
+    else:
+        handler.setFormatter(formatter or Formatter())
+        _logger.addHandler(handler)
     _logger.setLevel(log_level)
     return _logger
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import resource
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core import ms_config
+
+Labels = Tuple[Tuple[str, str], ...]
+Gauge = Tuple[str, str, Dict[str, str], float]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+_process_started = time.time()
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    formatted = ",".join(f'{name}="{str(value).translate(_LABEL_ESCAPES)}"' for name, value in labels)
+    return "{" + formatted + "}" if formatted else ""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class MetricsRegistry:
+    """Counters and histograms of this process, summed over every worker's snapshot when a directory is set."""
+
+    directory: Optional[str] = None
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    _descriptions: Dict[str, Tuple[str, str]] = field(default_factory=dict, init=False)
+    _counters: Dict[Tuple[str, Labels], float] = field(default_factory=dict, init=False)
+    _histograms: Dict[Tuple[str, Labels], List[float]] = field(default_factory=dict, init=False)
+
+    def describe(self, name: str, kind: str, help: str):
+        self._descriptions[name] = (kind, help)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        key = (name, _labels(labels))
+        self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = (name, _labels(labels))
+        # One count per bucket, then +Inf, sum and count.
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = [0.0] * (len(self.buckets) + 3)
+        histogram[bisect_left(self.buckets, value)] += 1
+        histogram[-2] += value
+        histogram[-1] += 1
+
+    def snapshot(self, gauges: Iterable[Gauge] = ()) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+            "histograms": [[name, labels, values] for (name, labels), values in self._histograms.items()],
+            "gauges": [list(gauge) for gauge in gauges],
+        }
+
+    def write_snapshot(self, gauges: Iterable[Gauge] = ()):
+        if self.directory is None:
+            return
+        path = Path(self.directory) / f"metrics_{os.getpid()}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.snapshot(gauges)))
+        os.replace(temporary, path)
+
+    def _snapshots(self, gauges: List[Gauge]) -> List[Dict[str, Any]]:
+        if self.directory is None:
+            return [self.snapshot(gauges)]
+        self.write_snapshot(gauges)
+        snapshots = []
+        for path in Path(self.directory).glob("metrics_*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self, gauges: Iterable[Gauge] = ()) -> str:
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        current_gauges: Dict[Tuple[str, Labels], Tuple[str, float]] = {}
+        for snapshot in self._snapshots(list(gauges)):
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, values in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [0.0] * len(values))
+                for index, value in enumerate(values):
+                    merged[index] += value
+            # Counters of exited workers still count, their gauges do not.
+            if snapshot["pid"] == os.getpid() or _pid_alive(snapshot["pid"]):
+                for name, kind, labels, value in snapshot["gauges"]:
+                    key = (name, _labels({**labels, "pid": str(snapshot["pid"])}))
+                    current_gauges[key] = (kind, value)
+
+        lines: List[str] = []
+        described = set()
+
+        def header(name: str, kind: str):
+            if name not in described:
+                described.add(name)
+                kind, help = self._descriptions.get(name, (kind, name))
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (name, labels), values in sorted(histograms.items()):
+            header(name, "histogram")
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels((*labels, ('le', str(bound))))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+        for (name, labels), (kind, value) in sorted(current_gauges.items()):
+            header(name, kind)
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def process_gauges() -> List[Gauge]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    gauges: List[Gauge] = [
+        ("process_cpu_seconds_total", "counter", {}, usage.ru_utime + usage.ru_stime),
+        ("process_max_resident_memory_bytes", "gauge", {}, usage.ru_maxrss * 1024.0),
+        ("process_start_time_seconds", "gauge", {}, _process_started),
+    ]
+    if os.path.isdir("/proc/self/fd"):
+        gauges.append(("process_open_fds", "gauge", {}, float(len(os.listdir("/proc/self/fd")))))
+    return gauges
+
+
+async def flush_metrics_periodically(interval: float, gauges: Callable[[], List[Gauge]] = process_gauges):
+    while True:
+        await asyncio.sleep(interval)
+        metrics_registry.write_snapshot(gauges())
+
+
+metrics_registry = MetricsRegistry(directory=ms_config.metrics.multiprocess_directory)
+metrics_registry.describe("graphql_operations_total", "counter", "GraphQL operations executed.")
+metrics_registry.describe("graphql_operation_errors_total", "counter", "GraphQL operations that returned errors.")
+metrics_registry.describe("graphql_operation_duration_seconds", "histogram", "Sampled GraphQL operation latency.")
+metrics_registry.describe("graphql_field_duration_seconds", "histogram", "Sampled GraphQL field resolver latency.")
+metrics_registry.describe("graphql_field_errors_total", "counter", "Sampled GraphQL field resolver errors.")
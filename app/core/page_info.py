@@ -1,21 +1,29 @@
-from typing import Optional
+from enum import Enum
+from typing import Any, Optional, Tuple
 
 from pydantic import BaseModel
 
 
+class CountMode(Enum):
+    exact = "exact"
+    estimated = "estimated"
+    capped = "capped"
+
+
 class PaginationInfoDto(BaseModel):
     limit: int
     offset: int
 
 
-def generate_pagination_dto(
-    default_size: int,
-    max_size: int,
-    first: Optional[int],
-    last: Optional[int],
-    before: Optional[int],
-    after: Optional[int],
-) -> PaginationInfoDto:
+class KeysetPaginationInfoDto(BaseModel):
+    limit: int
+    keys: Tuple[str, ...]
+    values: Optional[Tuple[Any, ...]] = None
+    backward: bool = False
+    descending: bool = False
+
+
+def _check_arguments(first: Optional[int], last: Optional[int], before: Any, after: Any) -> None:
     if (
         after is not None
         and (before is not None or last is not None)
@@ -24,6 +32,17 @@ def generate_pagination_dto(
         or (last is not None and before is None)
     ):
         raise ValueError('Bad combinaisons between "after", "before", "first" and "last" parameters.')
+
+
+def generate_pagination_dto(
+    default_size: int,
+    max_size: int,
+    first: Optional[int],
+    last: Optional[int],
+    before: Optional[int],
+    after: Optional[int],
+) -> PaginationInfoDto:
+    _check_arguments(first, last, before, after)
     if after is not None:
         offset = after
         if first is not None:
@@ -48,3 +67,31 @@ def generate_pagination_dto(
         raise ValueError(f"Page length must be < {max_size}")
 
     return PaginationInfoDto(offset=offset, limit=limit)
+
+
+def generate_keyset_pagination_dto(
+    default_size: int,
+    max_size: int,
+    first: Optional[int],
+    last: Optional[int],
+    before: Optional[Tuple[Any, ...]],
+    after: Optional[Tuple[Any, ...]],
+    keys: Tuple[str, ...],
+    descending: bool = False,
+) -> KeysetPaginationInfoDto:
+    _check_arguments(first, last, before, after)
+    values = after if after is not None else before
+    if values is not None and len(values) != len(keys):
+        raise ValueError("Cursor does not match the pagination keys.")
+
+    if before is not None:
+        limit = last if last is not None else default_size
+    else:
+        limit = first if first is not None else default_size
+
+    if limit > max_size:
+        raise ValueError(f"Page length must be < {max_size}")
+
+    return KeysetPaginationInfoDto(
+        limit=limit, keys=keys, values=values, backward=before is not None, descending=descending
+    )
@@ -1,18 +1,189 @@
 import base64
-from functools import wraps
-from typing import Any, Awaitable, Callable, Iterable, Optional, Tuple, Type
+import binascii
+import json
+from collections.abc import Mapping
+from functools import lru_cache, wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    is_typeddict,
+)
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
 
-from app.core.page_info import generate_pagination_dto
 from app.core.exceptions import BadUserInputError
+from app.core.page_info import CountMode, generate_keyset_pagination_dto, generate_pagination_dto
+from app.core.selection import find_resolve_info, is_field_selected
 from app.core.type_pagination import BaseEdge, BasePaginatedResponse, PageInfo
 
+Counter = Callable[[CountMode, Optional[int]], Awaitable[int]]
+TotalCount = Union[int, Counter]
+
 
-def get_relay_node_cursor(position):
-    return base64.b64encode(str(position).encode("utf-8")).decode("utf-8")
+def get_relay_node_cursor(position: int) -> str:
+    return binascii.b2a_base64(b"%d" % position, newline=False).decode("ascii")
 
 
 def relay_cursor_to_int(cursor: str) -> int:
-    return int(base64.b64decode(cursor).decode("utf-8"))
+    return int(base64.b64decode(cursor))
+
+
+def get_relay_keyset_cursor(values: Sequence[Any]) -> str:
+    return binascii.b2a_base64(to_json(list(values)), newline=False).decode("ascii")
+
+
+@lru_cache
+def _type_adapter(python_type: type) -> TypeAdapter:
+    return TypeAdapter(python_type)
+
+
+def coerce_cursor_value(column: Any, value: Any) -> Any:
+    # Cursor values went through JSON, so UUIDs, datetimes, decimals... come back as strings.
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        return _type_adapter(python_type).validate_python(value)
+    except ValidationError as err:
+        raise ValueError("Invalid cursor.") from err
+
+
+def relay_cursor_to_keyset(cursor: str, columns: Optional[Sequence[Any]] = None) -> Tuple[Any, ...]:
+    values = json.loads(base64.b64decode(cursor))
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor.")
+    if columns is None:
+        return tuple(values)
+    if len(values) != len(columns):
+        raise ValueError("Cursor does not match the pagination keys.")
+    return tuple(coerce_cursor_value(column, value) for column, value in zip(columns, values))
+
+
+def get_node_keyset(node: Any, keys: Sequence[str]) -> Tuple[Any, ...]:
+    if isinstance(node, Mapping):
+        return tuple(node[key] for key in keys)
+    return tuple(getattr(node, key) for key in keys)
+
+
+class Connection(Dict[str, Any]):
+    """`BasePaginatedResponse` dict whose `edges` and `page_info` are built on first read, so that a query selecting
+    only `nodes` or `totalCount` never pays for them. Reading the whole dict, as iteration, `items()`, `json.dumps`
+    or comparisons do, builds them first."""
+
+    __slots__ = ("_pending",)
+
+    def __init__(
+        self,
+        nodes: Iterable[Any],
+        total_count: Optional[int],
+        edges: Callable[[], List[BaseEdge]],
+        page_info: Callable[[], PageInfo],
+    ):
+        super().__init__(nodes=nodes, total_count=total_count)
+        self._pending: Dict[str, Callable[[], Any]] = {"edges": edges, "page_info": page_info}
+
+    def _build_all(self) -> "Connection":
+        for key in list(self._pending):
+            self[key]
+        return self
+
+    def __missing__(self, key: str) -> Any:
+        build = self._pending.pop(key, None)
+        if build is None:
+            raise KeyError(key)
+        value = self[key] = build()
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any):
+        self._pending.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str):
+        if self._pending.pop(key, None) is None:
+            super().__delitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pending or super().__contains__(key)
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self._pending)
+
+    def clear(self):
+        self._pending.clear()
+        super().clear()
+
+    # Whole-dict reads build every pending key first.
+
+    def __iter__(self) -> Iterator[str]:
+        return dict.__iter__(self._build_all())
+
+    def __reversed__(self) -> Iterator[str]:
+        return dict.__reversed__(self._build_all())
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self._build_all())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Connection):
+            other._build_all()
+        return dict.__eq__(self._build_all(), other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __or__(self, other: Any) -> Dict[str, Any]:
+        return dict.__or__(self._build_all(), other)
+
+    def __ror__(self, other: Any) -> Dict[str, Any]:
+        return dict.__ror__(self._build_all(), other)
+
+    def __ior__(self, other: Any) -> "Connection":
+        self.update(other)
+        return self
+
+    def keys(self) -> Any:
+        return dict.keys(self._build_all())
+
+    def values(self) -> Any:
+        return dict.values(self._build_all())
+
+    def items(self) -> Any:
+        return dict.items(self._build_all())
+
+    def copy(self) -> Dict[str, Any]:
+        return dict.copy(self._build_all())
+
+    def pop(self, *args: Any) -> Any:
+        return dict.pop(self._build_all(), *args)
+
+    def popitem(self) -> Tuple[str, Any]:
+        return dict.popitem(self._build_all())
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        return dict.setdefault(self._build_all(), key, default)
+
+    def update(self, *args: Any, **kwargs: Any):
+        dict.update(self._build_all(), *args, **kwargs)
 
 
 def paginate(
@@ -20,8 +191,38 @@ def paginate(
     edge_class: Type[BaseEdge] = BaseEdge,
     max_size: int = 20,
     default_size: int = 20,
+    keyset: Optional[Sequence[str]] = None,
+    descending: bool = False,
+    count_mode: CountMode = CountMode.exact,
+    count_cap: Optional[int] = None,
+    keyset_model: Optional[type] = None,
 ) -> Callable:
-    def decorator_paginate(func: Callable[..., Awaitable[Tuple[Iterable, int]]]):
+    """With `keyset`, cursors hold these columns' values and the wrapped function receives a
+    `KeysetPaginationInfoDto` to apply with `build_keyset_pagination` instead of a limit/offset. Given the
+    `keyset_model`, cursor values are checked against its columns' types and arrive already coerced.
+
+    The wrapped function may return a counter such as `partial(repository.count, stmt)` instead of the total
+    count: it is only awaited, with `count_mode`, when `totalCount` or `pageInfo.hasNextPage` is selected.
+
+    The result is a `Connection`, a dict whose `edge_class` edges and page info are only built when they are read.
+    A `response_class` that is not a TypedDict is called instead, with every edge built upfront."""
+    if count_mode == CountMode.capped and count_cap is None:
+        raise ValueError("A count_cap is required to count in capped mode.")
+    eager_response = not is_typeddict(response_class)
+    keys = tuple(keyset or ())
+    columns = None if keyset_model is None else [getattr(keyset_model, key) for key in keys]
+
+    def decorator_paginate(func: Callable[..., Awaitable[Tuple[Iterable, TotalCount]]]):
+        def respond(
+            nodes: Iterable[Any],
+            total_count: Optional[int],
+            edges: Callable[[], List[BaseEdge]],
+            page_info: Callable[[], PageInfo],
+        ) -> BasePaginatedResponse:
+            if eager_response:
+                return response_class(edges=edges(), nodes=nodes, page_info=page_info(), total_count=total_count)
+            return Connection(nodes, total_count, edges, page_info)  # type: ignore
+
         @wraps(func)
         async def inner(
             *args: Any,
@@ -31,6 +232,9 @@ def paginate(
             after: Optional[str] = None,
             **kwargs: Any,
         ):
+            if keys:
+                return await keyset_page(*args, first=first, last=last, before=before, after=after, **kwargs)
+
             try:
                 dto = generate_pagination_dto(
                     default_size,
@@ -44,25 +248,96 @@ def paginate(
                 raise BadUserInputError(str(err))
 
             results, total_count = await func(*args, pagination_dto=dto, **kwargs)
+            if not isinstance(results, Sequence):
+                results = list(results)
+
+            offset = dto.offset
+            stop = offset + len(results)
+
+            if callable(total_count):
+                info = find_resolve_info(args, kwargs)
+                counter, total_count = total_count, None
+                if info is None or is_field_selected(info, "totalCount"):
+                    total_count = await counter(count_mode, count_cap)
+                if info is not None and not is_field_selected(info, "pageInfo", "hasNextPage"):
+                    has_next_page = False
+                elif total_count is not None and count_mode == CountMode.exact:
+                    has_next_page = stop < total_count
+                else:
+                    # Counting one row past the page is enough to know whether another one follows.
+                    has_next_page = stop < await counter(CountMode.capped, stop + 1)
+            else:
+                has_next_page = stop < total_count
+            has_rows = bool(results) if total_count is None else bool(total_count)
+
+            def edges() -> List[BaseEdge]:
+                return [
+                    edge_class(node=node, cursor=get_relay_node_cursor(position))
+                    for position, node in enumerate(results, start=offset + 1)
+                ]
+
+            def page_info() -> PageInfo:
+                return PageInfo(
+                    has_next_page=has_next_page,
+                    has_previous_page=offset > 0,
+                    start_cursor=get_relay_node_cursor(offset + 1) if has_rows else None,
+                    end_cursor=get_relay_node_cursor(stop) if has_rows else None,
+                )
+
+            return respond(results, total_count, edges, page_info)
+
+        async def keyset_page(
+            *args: Any,
+            first: Optional[int],
+            last: Optional[int],
+            before: Optional[str],
+            after: Optional[str],
+            **kwargs: Any,
+        ):
+            try:
+                dto = generate_keyset_pagination_dto(
+                    default_size,
+                    max_size,
+                    first,
+                    last,
+                    before=None if before is None else relay_cursor_to_keyset(before, columns),
+                    after=None if after is None else relay_cursor_to_keyset(after, columns),
+                    keys=keys,
+                    descending=descending,
+                )
+            except ValueError as err:
+                raise BadUserInputError(str(err))
+
+            results, total_count = await func(*args, pagination_dto=dto, **kwargs)
+
+            if callable(total_count):
+                info = find_resolve_info(args, kwargs)
+                if info is None or is_field_selected(info, "totalCount"):
+                    total_count = await total_count(count_mode, count_cap)
+                else:
+                    total_count = None
+
+            results = list(results)
+            has_more = len(results) > dto.limit
+            del results[dto.limit :]
+            if dto.backward:
+                results.reverse()
+
+            def cursor(node: Any) -> str:
+                return get_relay_keyset_cursor(get_node_keyset(node, keys))
+
+            def edges() -> List[BaseEdge]:
+                return [edge_class(node=node, cursor=cursor(node)) for node in results]
+
+            def page_info() -> PageInfo:
+                return PageInfo(
+                    has_next_page=True if dto.backward else has_more,
+                    has_previous_page=has_more if dto.backward else after is not None,
+                    start_cursor=cursor(results[0]) if results else None,
+                    end_cursor=cursor(results[-1]) if results else None,
+                )
 
-            edges = [
-                edge_class(node=node, cursor=get_relay_node_cursor(position + 1 + dto.offset))
-                for position, node in enumerate(results)
-            ]
-
-            stop = dto.offset + len(edges)
-
-            return response_class(
-                edges=edges,
-                nodes=results,
-                page_info=PageInfo(
-                    has_next_page=stop < total_count,
-                    has_previous_page=dto.offset > 0,
-                    start_cursor=get_relay_node_cursor(dto.offset + 1) if total_count else None,
-                    end_cursor=get_relay_node_cursor(stop) if total_count else None,
-                ),
-                total_count=total_count,
-            )
+            return respond(results, total_count, edges, page_info)
 
         return inner
 
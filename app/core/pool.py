@@ -0,0 +1,57 @@
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+@dataclass
+class PoolStatistics:
+    checkouts: int = 0
+    timeouts: int = 0
+    waiting: int = 0
+    checkout_seconds_total: float = 0.0
+    checkout_seconds_max: float = 0.0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` timing every checkout, including the wait for a free connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.statistics = PoolStatistics()
+
+    def connect(self):  # pyright: ignore [reportIncompatibleMethodOverride]
+        statistics = self.statistics
+        statistics.waiting += 1
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            statistics.timeouts += 1
+            raise
+        finally:
+            statistics.waiting -= 1
+        elapsed = perf_counter() - start
+        statistics.checkouts += 1
+        statistics.checkout_seconds_total += elapsed
+        statistics.checkout_seconds_max = max(statistics.checkout_seconds_max, elapsed)
+        return connection
+
+
+def pool_statistics(engine: AsyncEngine) -> Dict[str, Any]:
+    pool: Pool = engine.sync_engine.pool
+    statistics: Dict[str, Any] = {}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        statistics.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        statistics.update(asdict(pool.statistics))
+    return statistics
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core import ms_config
+from app.core.db import engine
+from app.core.logging import logger
+from app.core.pool import pool_statistics
+from app.graphql.client import get_gateway_client
+
+
+@dataclass
+class CheckResult:
+    ok: bool
+    checked_at: float
+    duration_ms: float
+    detail: Optional[str] = None
+
+
+async def check_pool():
+    statistics = pool_statistics(engine)
+    if statistics.get("waiting") and statistics["checked_out"] >= statistics["size"] + statistics["max_overflow"]:
+        raise RuntimeError(f"pool exhausted, {statistics['waiting']} waiting")
+
+
+async def check_database():
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_gateway():
+    response = await get_gateway_client().post("/v2/graphql", json={"query": "{ __typename }"})
+    if response.status_code >= 500:
+        raise RuntimeError(f"gateway answered {response.status_code}")
+
+
+@dataclass
+class ReadinessMonitor:
+    """Runs the dependency checks in the background so that probes only read the last results."""
+
+    interval: float
+    timeout: float
+    checks: Dict[str, Callable[[], Awaitable[Any]]]
+    results: Dict[str, CheckResult] = field(default_factory=dict, init=False)
+    refreshed_at: float = field(default=0.0, init=False)
+
+    async def _check(self, name: str, check: Callable[[], Awaitable[Any]]) -> CheckResult:
+        started = perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+            ok, detail = True, None
+        except Exception as exc:
+            ok, detail = False, f"{type(exc).__name__}: {exc}"
+            logger.warning("readiness check failed", extra={"check": name, "detail": detail})
+        return CheckResult(ok, time.time(), round((perf_counter() - started) * 1000, 1), detail)
+
+    async def refresh(self):
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._check(name, self.checks[name]) for name in names))
+        self.results = dict(zip(names, results))
+        self.refreshed_at = time.time()
+
+    async def run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def report(self) -> Tuple[bool, Dict[str, Any]]:
+        # Results older than a few intervals mean the monitor itself is stuck.
+        fresh = time.time() - self.refreshed_at <= self.interval * 3
+        ready = fresh and bool(self.results) and all(result.ok for result in self.results.values())
+        return ready, {
+            "status": "ready" if ready else "unavailable",
+            "checks": {name: vars(result) for name, result in self.results.items()},
+        }
+
+
+readiness_monitor = ReadinessMonitor(
+    interval=ms_config.readiness.interval_seconds,
+    timeout=ms_config.readiness.timeout_seconds,
+    checks={"pool": check_pool, "database": check_database, "gateway": check_gateway},
+)
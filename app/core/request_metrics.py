@@ -0,0 +1,75 @@
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class RequestMetrics:
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    gateway_calls: int = 0
+    gateway_seconds: float = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        return ", ".join(
+            (
+                f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_statements} statements"',
+                f'gateway;dur={self.gateway_seconds * 1000:.1f};desc="{self.gateway_calls} calls"',
+                f"total;dur={total_seconds * 1000:.1f}",
+            )
+        )
+
+    def as_log_fields(self, total_seconds: float) -> Dict[str, Any]:
+        return {
+            "duration_ms": round(total_seconds * 1000, 1),
+            "sql_statements": self.sql_statements,
+            "sql_ms": round(self.sql_seconds * 1000, 1),
+            "gateway_calls": self.gateway_calls,
+            "gateway_ms": round(self.gateway_seconds * 1000, 1),
+        }
+
+
+ctx_request_metrics: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+
+@contextmanager
+def request_metrics_context():
+    metrics = RequestMetrics()
+    token = ctx_request_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        ctx_request_metrics.reset(token)
+
+
+def record_gateway_call(seconds: float):
+    metrics = ctx_request_metrics.get()
+    if metrics is not None:
+        metrics.gateway_calls += 1
+        metrics.gateway_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._request_metrics_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # SQLAlchemy runs the driver calls in a greenlet that shares the caller's contextvars.
+    metrics = ctx_request_metrics.get()
+    started = getattr(context, "_request_metrics_started", None)
+    if metrics is not None and started is not None:
+        metrics.sql_statements += 1
+        metrics.sql_seconds += perf_counter() - started
+
+
+def instrument_engine(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
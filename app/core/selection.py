@@ -0,0 +1,47 @@
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLResolveInfo,
+    InlineFragmentNode,
+    SelectionSetNode,
+)
+
+
+def _iter_fields(
+    selection_set: Optional[SelectionSetNode], fragments: Dict[str, FragmentDefinitionNode]
+) -> Iterator[FieldNode]:
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _iter_fields(selection.selection_set, fragments)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                yield from _iter_fields(fragment.selection_set, fragments)
+
+
+def is_field_selected(info: GraphQLResolveInfo, *path: str) -> bool:
+    nodes = list(info.field_nodes)
+    for name in path:
+        nodes = [
+            field
+            for node in nodes
+            for field in _iter_fields(node.selection_set, info.fragments)
+            if field.name.value == name
+        ]
+        if not nodes:
+            return False
+    return True
+
+
+def find_resolve_info(args: Sequence[Any], kwargs: Dict[str, Any]) -> Optional[GraphQLResolveInfo]:
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, GraphQLResolveInfo):
+            return value
+    return None
@@ -18,4 +18,4 @@ class BasePaginatedResponse(TypedDict):
     edges: List[BaseEdge]
     nodes: Iterable[Dict[str, Any]]
     page_info: PageInfo
-    total_count: int
+    total_count: Optional[int]
@@ -1,13 +1,19 @@
+import asyncio
+import hashlib
 from dataclasses import dataclass, field
-from typing import Any, Dict, Generic, NotRequired, TypedDict, TypeVar
+from time import perf_counter
+from typing import Any, Dict, Generic, List, NotRequired, Optional, Set, Tuple, TypedDict, TypeVar
 
-from httpx import USE_CLIENT_DEFAULT, AsyncClient, Headers, Response
+from httpx import USE_CLIENT_DEFAULT, AsyncClient, Headers, Limits, Response, Timeout
 from httpx._client import UseClientDefault
 from httpx._types import AuthTypes, HeaderTypes
 from pydantic import AliasChoices, AliasPath, BaseModel, Field, TypeAdapter, ValidationError
+from pydantic_core import to_json
 
 from app.core import ms_config as config
 from app.core.logging import ctx_correlation_id, ctx_step
+from app.core.request_metrics import record_gateway_call
+from app.graphql.response_cache import response_cache
 
 
 class GraphqlError(BaseModel):
@@ -37,18 +43,105 @@ class GraphQLResponse(BaseModel, Generic[D]):
     errors: list[GraphqlError] | None = None
 
 
+_gateway_client: Optional[AsyncClient] = None
+
+
+def _create_gateway_client() -> AsyncClient:
+    settings = config.graphql_gateway
+    return AsyncClient(
+        base_url=config.graphql_gateway_url,
+        http2=settings.http2,
+        limits=Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=Timeout(settings.timeout),
+    )
+
+
+def get_gateway_client() -> AsyncClient:
+    global _gateway_client
+    if _gateway_client is None or _gateway_client.is_closed:
+        _gateway_client = _create_gateway_client()
+    return _gateway_client
+
+
+async def close_gateway_client():
+    global _gateway_client
+    client, _gateway_client = _gateway_client, None
+    if client is not None:
+        await client.aclose()
+
+
+@dataclass
+class _PendingBatch:
+    headers: Headers
+    items: List[Tuple[GraphQLBody, asyncio.Future[Dict[str, Any]]]] = field(default_factory=list)
+
+
+@dataclass
+class _GatewayBatcher:
+    window_seconds: float
+    max_batch_size: int
+    _pending: Dict[Tuple[Tuple[str, str], ...], _PendingBatch] = field(default_factory=dict)
+    _tasks: Set["asyncio.Future[None]"] = field(default_factory=set)
+
+    async def run(self, json: GraphQLBody, headers: Headers) -> Dict[str, Any]:
+        key = tuple(sorted(headers.items()))
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(headers)
+            asyncio.get_running_loop().call_later(self.window_seconds, self._dispatch, key, batch)
+
+        future: asyncio.Future[Dict[str, Any]] = asyncio.get_running_loop().create_future()
+        batch.items.append((json, future))
+        if len(batch.items) >= self.max_batch_size:
+            self._dispatch(key, batch)
+        return await future
+
+    def _dispatch(self, key: Tuple[Tuple[str, str], ...], batch: _PendingBatch):
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+            task = asyncio.ensure_future(self._send(batch))
+            # The event loop only keeps weak references to tasks.
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: _PendingBatch):
+        futures = [future for _, future in batch.items]
+        try:
+            response = await get_gateway_client().post(
+                "/v2/graphql", headers=batch.headers, json=[body for body, _ in batch.items]
+            )
+            response.raise_for_status()
+            results = response.json()
+            if not isinstance(results, list) or len(results) != len(futures):
+                raise GraphqlClientError()
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_gateway_batcher = _GatewayBatcher(
+    window_seconds=config.graphql_gateway.batch_window_seconds,
+    max_batch_size=config.graphql_gateway.max_batch_size,
+)
+
+
 @dataclass
 class GraphQLClient[T: BaseModel]:
-    _client: AsyncClient = field(
-        default=AsyncClient(base_url=config.graphql_gateway_url),
-        init=False,
-    )
+    batching: bool = config.graphql_gateway.batching
 
     @property
     def client(self):
-        if self._client.is_closed:
-            self._client = AsyncClient(base_url=config.graphql_gateway_url)
-        return self._client
+        return get_gateway_client()
 
     def set_headers_context(self, headers: HeaderTypes | None = None) -> Headers:
         headers = Headers(headers)
@@ -64,10 +157,45 @@ class GraphQLClient[T: BaseModel]:
         response_body_class: type[T],
         auth: AuthTypes | UseClientDefault = USE_CLIENT_DEFAULT,
         headers: HeaderTypes | None = None,
+        cache_ttl: float | None = None,
     ) -> GraphQLResponse[T]:
-        response = await self.client.post(
-            "/v2/graphql", auth=auth, headers=self.set_headers_context(headers), json=json
+        headers = self.set_headers_context(headers)
+        if cache_ttl is not None and isinstance(auth, (UseClientDefault, tuple)):
+            return await response_cache.get_or_fetch(
+                self._cache_key(json, response_body_class, auth, headers),
+                cache_ttl,
+                lambda: self._run(json, response_body_class, auth, headers),
+                lambda response: not response.errors,
+            )
+        return await self._run(json, response_body_class, auth, headers)
+
+    def _cache_key(
+        self, json: GraphQLBody, response_body_class: type[T], auth: AuthTypes | UseClientDefault, headers: Headers
+    ) -> str:
+        key = to_json(
+            {
+                "query": json["query"],
+                "variables": json.get("variables"),
+                "auth": None if isinstance(auth, UseClientDefault) else auth,
+                "authorization": headers.get("authorization"),
+                "cookie": headers.get("cookie"),
+                "class": f"{response_body_class.__module__}.{response_body_class.__qualname__}",
+            }
         )
+        return hashlib.sha256(key).hexdigest()
+
+    async def _run(
+        self, json: GraphQLBody, response_body_class: type[T], auth: AuthTypes | UseClientDefault, headers: Headers
+    ) -> GraphQLResponse[T]:
+        start = perf_counter()
+        try:
+            if self.batching and isinstance(auth, UseClientDefault):
+                data = await _gateway_batcher.run(json, headers)
+                return self._handle_data(data, response_body_class)
+
+            response = await self.client.post("/v2/graphql", auth=auth, headers=headers, json=json)
+        finally:
+            record_gateway_call(perf_counter() - start)
 
         return self._handle_response(response, response_body_class)
 
@@ -77,7 +205,9 @@ class GraphQLClient[T: BaseModel]:
         response_body_class: type[T],
     ) -> GraphQLResponse[T]:
         response.raise_for_status()
-        data = response.json()
+        return self._handle_data(response.json(), response_body_class)
+
+    def _handle_data(self, data: Any, response_body_class: type[T]) -> GraphQLResponse[T]:
         try:
             return GraphQLResponse[response_body_class].model_validate(data)
         except ValidationError as exc:
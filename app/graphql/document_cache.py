@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Optional, Tuple, Type
+
+from ariadne.validation.introspection_disabled import IntrospectionDisabledRule
+from graphql import (
+    ASTValidationRule,
+    DocumentNode,
+    GraphQLError,
+    GraphQLSchema,
+    TypeInfo,
+    parse,
+    specified_rules,
+    validate,
+)
+
+from app.core import ms_config
+
+# Rules whose outcome only depends on the schema and the document; any other rule runs on every request.
+_cacheable_rules = frozenset((*specified_rules, IntrospectionDisabledRule))
+
+
+@dataclass
+class _CachedDocument:
+    document: DocumentNode
+    errors: Dict[Tuple[int, Tuple[Type[ASTValidationRule], ...]], List[GraphQLError]] = field(default_factory=dict)
+
+
+@dataclass
+class DocumentCache:
+    max_size: int
+    _entries: "OrderedDict[str, _CachedDocument]" = field(default_factory=OrderedDict, init=False)
+    _by_document: Dict[int, _CachedDocument] = field(default_factory=dict, init=False)
+
+    def parse(self, context_value: Any, data: Dict[str, Any]) -> DocumentNode:
+        query = data["query"]
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            return entry.document
+
+        entry = _CachedDocument(parse(query))
+        self._entries[query] = entry
+        self._by_document[id(entry.document)] = entry
+        if len(self._entries) > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            del self._by_document[id(evicted.document)]
+        return entry.document
+
+    def validate(
+        self,
+        schema: GraphQLSchema,
+        document_ast: DocumentNode,
+        rules: Optional[Collection[Type[ASTValidationRule]]] = None,
+        max_errors: Optional[int] = None,
+        type_info: Optional[TypeInfo] = None,
+    ) -> List[GraphQLError]:
+        entry = self._by_document.get(id(document_ast))
+        if entry is None or entry.document is not document_ast or type_info is not None:
+            return validate(schema, document_ast, rules, max_errors, type_info)
+
+        rules = tuple(rules) if rules is not None else tuple(specified_rules)
+        cacheable_rules = tuple(rule for rule in rules if rule in _cacheable_rules)
+        request_rules = tuple(rule for rule in rules if rule not in _cacheable_rules)
+
+        key = (id(schema), cacheable_rules)
+        errors = entry.errors.get(key)
+        if errors is None:
+            errors = entry.errors[key] = validate(schema, document_ast, cacheable_rules, max_errors)
+        if not errors and request_rules:
+            return validate(schema, document_ast, request_rules, max_errors)
+        return list(errors)
+
+
+document_cache = DocumentCache(ms_config.graphql.document_cache_size)
@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
+from typing import Any, Optional
 
 from ariadne.asgi.handlers import GraphQLHTTPHandler
+from ariadne.types import GraphQLResult
+from graphql import DocumentNode
 from starlette.requests import Request
 from starlette.responses import Response
 
 from app.core import ms_config
+from app.core.exceptions import BadUserInputError, PersistedQueryNotFoundError
+from app.graphql.persisted_queries import persisted_queries, persisted_query_error
 
 
 class HTTPHandler(GraphQLHTTPHandler):
@@ -24,6 +29,25 @@ class HTTPHandler(GraphQLHTTPHandler):
             samesite="none" if front_localdev else "strict",
         )
 
+    async def execute_graphql_query(
+        self,
+        request: Any,
+        data: Any,
+        *,
+        context_value: Any = None,
+        query_document: Optional[DocumentNode] = None,
+    ) -> GraphQLResult:
+        try:
+            data = persisted_queries.resolve(data)
+        except PersistedQueryNotFoundError:
+            # Apollo clients expect this exact message to retry with the full query text.
+            return True, persisted_query_error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        except BadUserInputError as err:
+            return False, persisted_query_error(str(err), "BAD_USER_INPUT")
+        return await super().execute_graphql_query(
+            request, data, context_value=context_value, query_document=query_document
+        )
+
     async def create_json_response(
         self,
         request: Request,
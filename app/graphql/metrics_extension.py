@@ -0,0 +1,83 @@
+import random
+import re
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, List, Optional, Set
+
+from ariadne.types import ContextValue, Extension, Resolver
+from graphql import GraphQLError, GraphQLResolveInfo, OperationDefinitionNode
+
+from app.core import ms_config
+from app.core.metrics import metrics_registry
+
+_OPERATION_NAME = re.compile(r"[_A-Za-z][_0-9A-Za-z]{0,63}")
+_operation_labels: Set[str] = set()
+
+
+def operation_label(operation: Optional[OperationDefinitionNode]) -> str:
+    """Bounded label for the executed operation: client-chosen names must not create series without limit."""
+    if operation is None:
+        return "unexecuted"
+    if operation.name is None:
+        return "anonymous"
+    name = operation.name.value
+    if name not in _operation_labels:
+        if not _OPERATION_NAME.fullmatch(name) or len(_operation_labels) >= ms_config.metrics.max_operation_labels:
+            return "other"
+        _operation_labels.add(name)
+    return name
+
+
+class MetricsExtension(Extension):
+    def __init__(self):
+        self.sampled = random.random() < ms_config.metrics.graphql_sample_rate
+        self.errors = 0
+        self.started = 0.0
+        self.operation: Optional[OperationDefinitionNode] = None
+
+    def request_started(self, context: ContextValue):
+        self.started = perf_counter()
+
+    def has_errors(self, errors: List[GraphQLError], context: ContextValue):
+        self.errors = len(errors)
+
+    def request_finished(self, context: ContextValue):
+        operation = self.operation
+        if operation is None and not self.errors and isinstance(context, dict):
+            # Operations selecting only __typename never reach the resolvers.
+            operation = context.get("operation")
+        labels = {"operation": operation_label(operation)}
+        metrics_registry.inc("graphql_operations_total", labels)
+        if self.errors:
+            metrics_registry.inc("graphql_operation_errors_total", labels)
+        if self.sampled:
+            metrics_registry.observe("graphql_operation_duration_seconds", perf_counter() - self.started, labels)
+
+    def resolve(self, next_: Resolver, obj: Any, info: GraphQLResolveInfo, **kwargs: Any) -> Any:
+        if self.operation is None:
+            # Only validated operations reach the resolvers, this is the one graphql-core picked to execute.
+            self.operation = info.operation
+        if not self.sampled or info.parent_type.name.startswith("__"):
+            return next_(obj, info, **kwargs)
+
+        labels = {"field": f"{info.parent_type.name}.{info.field_name}"}
+        started = perf_counter()
+        try:
+            result = next_(obj, info, **kwargs)
+        except Exception:
+            metrics_registry.inc("graphql_field_errors_total", labels)
+            raise
+        if not isawaitable(result):
+            metrics_registry.observe("graphql_field_duration_seconds", perf_counter() - started, labels)
+            return result
+
+        async def await_result():
+            try:
+                value = await result
+            except Exception:
+                metrics_registry.inc("graphql_field_errors_total", labels)
+                raise
+            metrics_registry.observe("graphql_field_duration_seconds", perf_counter() - started, labels)
+            return value
+
+        return await_result()
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
+from typing import Any, Dict
+
+from app.core import ms_config
+from app.core.exceptions import BadUserInputError, PersistedQueryNotFoundError
+
+
+@dataclass
+class PersistedQueryStore:
+    max_size: int
+    _queries: "OrderedDict[str, str]" = field(default_factory=OrderedDict, init=False)
+
+    def resolve(self, data: Any) -> Any:
+        """Returns the request data with its query filled from the Automatic Persisted Queries extension."""
+        if not isinstance(data, dict) or not isinstance(data.get("extensions"), dict):
+            return data
+        persisted_query = data["extensions"].get("persistedQuery")
+        if not isinstance(persisted_query, dict):
+            return data
+        query_hash = persisted_query.get("sha256Hash")
+        if persisted_query.get("version") != 1 or not isinstance(query_hash, str):
+            raise BadUserInputError("Unsupported persisted query.")
+
+        query = data.get("query")
+        if isinstance(query, str) and query:
+            if sha256(query.encode("utf-8")).hexdigest() != query_hash:
+                raise BadUserInputError("Provided sha does not match query.")
+            self._store(query_hash, query)
+            return data
+
+        query = self._queries.get(query_hash)
+        if query is None:
+            raise PersistedQueryNotFoundError()
+        self._queries.move_to_end(query_hash)
+        return {**data, "query": query}
+
+    def _store(self, query_hash: str, query: str):
+        self._queries[query_hash] = query
+        self._queries.move_to_end(query_hash)
+        if len(self._queries) > self.max_size:
+            self._queries.popitem(last=False)
+
+
+persisted_queries = PersistedQueryStore(ms_config.graphql.persisted_queries_cache_size)
+
+
+def persisted_query_error(message: str, code: str) -> Dict[str, Any]:
+    return {"errors": [{"message": message, "extensions": {"code": code}}]}
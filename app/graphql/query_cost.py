@@ -0,0 +1,242 @@
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, Optional, Set, Tuple
+
+from ariadne.types import ContextValue, Extension
+from graphql import (
+    ASTValidationRule,
+    DocumentNode,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    ListValueNode,
+    OperationDefinitionNode,
+    SchemaMetaFieldDef,
+    SelectionSetNode,
+    StringValueNode,
+    TypeMetaFieldDef,
+    TypeNameMetaFieldDef,
+    ValidationContext,
+    ValidationRule,
+    get_named_type,
+    is_leaf_type,
+)
+from graphql.execution.values import get_argument_values
+from graphql.language.visitor import SKIP
+
+from app.core import ms_config
+
+CONNECTION_SIZE_ARGUMENTS = ("first", "last")
+
+
+@dataclass
+class QueryCost:
+    cost: int
+    depth: int
+    fields: int
+    maximum_cost: int
+    maximum_depth: int
+    maximum_fields: int
+
+    def as_extension(self) -> Dict[str, Any]:
+        return {
+            "requestedQueryCost": self.cost,
+            "maximumAvailable": self.maximum_cost,
+            "depth": self.depth,
+            "maximumDepth": self.maximum_depth,
+            "fields": self.fields,
+            "maximumFields": self.maximum_fields,
+        }
+
+
+@dataclass
+class QueryCostAnalyzer:
+    """Static cost of an operation: every non-leaf field costs 1 unless it carries `@cost(complexity: ...)`, and
+    the selection of a connection is multiplied by its `first`/`last` argument (or the `@cost` multipliers).
+
+    Every selected field, leaves and aliases included, also counts in `fields`, once per fragment expansion. The
+    walk stops once `max_fields` is exceeded, so cost and depth are then partial."""
+
+    context: ValidationContext
+    variables: Optional[Dict[str, Any]]
+    default_connection_size: int
+    max_fields: int
+    fields: int = field(default=0, init=False)
+    _fragments_path: Set[str] = field(default_factory=set, init=False)
+
+    def measure(self, operation: OperationDefinitionNode) -> Tuple[int, int]:
+        root_type = self.context.schema.get_root_type(operation.operation)
+        if root_type is None:
+            return 0, 0
+        return self._selection_set_cost(operation.selection_set, root_type, 0)
+
+    def _selection_set_cost(
+        self, selection_set: SelectionSetNode, parent_type: GraphQLNamedType, depth: int
+    ) -> Tuple[int, int]:
+        total, max_depth = 0, depth
+        for selection in selection_set.selections:
+            if self.fields > self.max_fields:
+                break
+            if isinstance(selection, FieldNode):
+                cost, field_depth = self._field_cost(selection, parent_type, depth + 1)
+            elif isinstance(selection, InlineFragmentNode):
+                type_condition = selection.type_condition
+                fragment_type = self.context.schema.get_type(type_condition.name.value) if type_condition else None
+                cost, field_depth = self._selection_set_cost(
+                    selection.selection_set, fragment_type or parent_type, depth
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                cost, field_depth = self._fragment_cost(selection, depth)
+            else:
+                continue
+            total += cost
+            max_depth = max(max_depth, field_depth)
+        return total, max_depth
+
+    def _fragment_cost(self, spread: FragmentSpreadNode, depth: int) -> Tuple[int, int]:
+        name = spread.name.value
+        fragment = self.context.get_fragment(name)
+        # Cycles are reported by the NoFragmentCyclesRule, they only need to not loop forever here.
+        if fragment is None or name in self._fragments_path:
+            return 0, depth
+        fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+        if fragment_type is None:
+            return 0, depth
+        self._fragments_path.add(name)
+        try:
+            return self._selection_set_cost(fragment.selection_set, fragment_type, depth)
+        finally:
+            self._fragments_path.discard(name)
+
+    def _field_definition(self, node: FieldNode, parent_type: GraphQLNamedType) -> Optional[GraphQLField]:
+        # Meta fields are not part of the types' fields but introspection can be nested just as deep.
+        name = node.name.value
+        if name == "__typename":
+            return TypeNameMetaFieldDef
+        if parent_type is self.context.schema.query_type:
+            if name == "__schema":
+                return SchemaMetaFieldDef
+            if name == "__type":
+                return TypeMetaFieldDef
+        if not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return None
+        return parent_type.fields.get(name)
+
+    def _field_cost(self, node: FieldNode, parent_type: GraphQLNamedType, depth: int) -> Tuple[int, int]:
+        self.fields += 1
+        field_def = self._field_definition(node, parent_type)
+        if field_def is None:
+            return 0, depth
+
+        field_type = get_named_type(field_def.type)
+        complexity, multiplier_arguments = self._cost_directive(field_def)
+        if complexity is None:
+            complexity = 0 if is_leaf_type(field_type) else 1
+        if node.selection_set is None:
+            return complexity, depth
+
+        children_cost, children_depth = self._selection_set_cost(node.selection_set, field_type, depth)
+        return complexity + self._multiplier(field_def, node, multiplier_arguments) * children_cost, children_depth
+
+    def _multiplier(self, field_def: GraphQLField, node: FieldNode, multiplier_arguments: Collection[str]) -> int:
+        arguments = multiplier_arguments or [name for name in CONNECTION_SIZE_ARGUMENTS if name in field_def.args]
+        if not arguments:
+            return 1
+        try:
+            values = get_argument_values(field_def, node, self.variables)
+        except GraphQLError:
+            # Bad arguments are reported by the other validation rules.
+            values = {}
+        sizes = [values[name] for name in arguments if isinstance(values.get(name), int)]
+        if not multiplier_arguments and not sizes:
+            return self.default_connection_size
+        return max(sum(sizes), 1)
+
+    def _cost_directive(self, field_def: GraphQLField) -> Tuple[Optional[int], Collection[str]]:
+        directive = next(
+            (
+                item
+                for item in (field_def.ast_node.directives if field_def.ast_node else ())
+                if item.name.value == "cost"
+            ),
+            None,
+        )
+        if directive is None:
+            return None, ()
+        complexity, multipliers = None, []
+        for argument in directive.arguments:
+            if argument.name.value == "complexity" and isinstance(argument.value, IntValueNode):
+                complexity = int(argument.value.value)
+            elif argument.name.value == "multipliers" and isinstance(argument.value, ListValueNode):
+                multipliers = [value.value for value in argument.value.values if isinstance(value, StringValueNode)]
+        return complexity, multipliers
+
+
+def query_cost_validator(
+    context_value: ContextValue, document: DocumentNode, data: Dict[str, Any]
+) -> Collection[type[ASTValidationRule]]:
+    """`validation_rules` factory measuring the executed operation and rejecting it over the configured limits."""
+    config = ms_config.graphql
+    operation_name = data.get("operationName")
+    variables = data.get("variables")
+
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args: Any):
+            if operation_name and (node.name is None or node.name.value != operation_name):
+                return SKIP
+            analyzer = QueryCostAnalyzer(
+                self.context, variables, config.default_connection_size, config.max_query_fields
+            )
+            cost, depth = analyzer.measure(node)
+            query_cost = QueryCost(
+                cost,
+                depth,
+                analyzer.fields,
+                config.max_query_cost,
+                config.max_query_depth,
+                config.max_query_fields,
+            )
+            if isinstance(context_value, dict):
+                context_value["query_cost"] = query_cost
+                context_value["operation"] = node
+
+            if analyzer.fields > config.max_query_fields:
+                self.report_error(
+                    GraphQLError(
+                        f"The query exceeds the maximum of {config.max_query_fields} fields.",
+                        extensions={"code": "QUERY_TOO_COMPLEX", "cost": query_cost.as_extension()},
+                    )
+                )
+            elif depth > config.max_query_depth:
+                self.report_error(
+                    GraphQLError(
+                        f"The query exceeds the maximum depth of {config.max_query_depth}. Actual depth is {depth}.",
+                        extensions={"code": "QUERY_TOO_COMPLEX", "cost": query_cost.as_extension()},
+                    )
+                )
+            elif cost > config.max_query_cost:
+                self.report_error(
+                    GraphQLError(
+                        f"The query exceeds the maximum cost of {config.max_query_cost}. Actual cost is {cost}.",
+                        extensions={"code": "QUERY_TOO_COMPLEX", "cost": query_cost.as_extension()},
+                    )
+                )
+            return SKIP
+
+        def enter_fragment_definition(self, *_args: Any):
+            return SKIP
+
+    return [QueryCostRule]
+
+
+class QueryCostExtension(Extension):
+    def format(self, context: ContextValue) -> dict:
+        query_cost = context.get("query_cost") if isinstance(context, dict) else None
+        if query_cost is None:
+            return {}
+        return {"cost": query_cost.as_extension()}
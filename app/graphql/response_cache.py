@@ -0,0 +1,49 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core import ms_config
+
+
+@dataclass
+class ResponseCache:
+    max_size: int
+    _entries: "OrderedDict[str, Tuple[float, Any]]" = field(default_factory=OrderedDict, init=False)
+    _in_flight: Dict[str, "asyncio.Task[Any]"] = field(default_factory=dict, init=False)
+
+    async def get_or_fetch(
+        self, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool]
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._store(key, ttl, done, cacheable))
+        # Shielded so that a cancelled caller does not cancel the request other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, ttl: float, task: "asyncio.Task[Any]", cacheable: Callable[[Any], bool]):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None or not cacheable(task.result()):
+            return
+        self._entries[key] = (monotonic() + ttl, task.result())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+response_cache = ResponseCache(max_size=ms_config.graphql_gateway.response_cache_size)
@@ -1,4 +1,4 @@
-import os
+from pathlib import Path
 
 from ariadne import load_schema_from_path, snake_case_fallback_resolvers
 from ariadne.contrib.federation.schema import make_federated_schema
@@ -6,12 +6,14 @@ from ariadne.contrib.federation.schema import make_federated_schema
 from app.graphql.mutation import mutation_type
 from app.graphql.resolver import resolver_type
 from app.graphql.scalars.uuid import uuid_scalar
+from app.startup import startup_phase
 
-type_defs = load_schema_from_path(f"{os.getcwd()}/app/graphql/schema.graphql")
-schema = make_federated_schema(
-    type_defs,
-    mutation_type,
-    resolver_type,
-    uuid_scalar,
-    snake_case_fallback_resolvers,
-)
+with startup_phase("schema"):
+    type_defs = load_schema_from_path(str(Path(__file__).parent / "schema.graphql"))
+    schema = make_federated_schema(
+        type_defs,
+        mutation_type,
+        resolver_type,
+        uuid_scalar,
+        snake_case_fallback_resolvers,
+    )
@@ -0,0 +1,36 @@
+from typing import Any, Type, TypeVar
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql.expression import Select
+
+from app.core.exceptions import BadUserInputError
+from app.core.page_info import KeysetPaginationInfoDto
+from app.core.pagination import coerce_cursor_value
+from app.models.base_model import Base
+
+T = TypeVar("T", bound=Base)
+V = TypeVar("V", bound=Any)
+
+
+class KeysetPaginationMixin:
+    def build_keyset_pagination(
+        self, class_name: Type[T], stmt: Select[V], pagination: KeysetPaginationInfoDto
+    ) -> Select[V]:
+        columns = [getattr(class_name, key) for key in pagination.keys]
+        reverse = pagination.backward != pagination.descending
+
+        if pagination.values is not None:
+            seek = tuple_(*columns)
+            try:
+                values = [coerce_cursor_value(column, value) for column, value in zip(columns, pagination.values)]
+            except ValueError as err:
+                raise BadUserInputError(str(err))
+            cursor = tuple_(*(literal(value, type_=column.type) for column, value in zip(columns, values)))
+            stmt = stmt.where(seek < cursor if reverse else seek > cursor)
+
+        # One extra row tells the paginator whether another page exists without counting.
+        return (
+            stmt.order_by(None)
+            .order_by(*(column.desc() if reverse else column.asc() for column in columns))
+            .limit(pagination.limit + 1)
+        )
@@ -1,22 +1,48 @@
-from typing import Any, Iterable, Type, TypeVar
+import operator
+from functools import reduce
+from typing import Any, Iterable, List, Type, TypeVar
 
+from sqlalchemy import func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.expression import Select
 
 from app.models.base_model import Base
-from app.models.types import SQLGenericSearch
+from app.models.types import TEXT_SEARCH_CONFIG, SearchMode, SQLGenericSearch
 
 T = TypeVar("T", bound=Base)
 V = TypeVar("V", bound=Any)
 
 
+def text_search_config(config: str = TEXT_SEARCH_CONFIG) -> ColumnElement[Any]:
+    # Rendered inline rather than bound so the expression matches the one of the full-text index.
+    return literal_column(f"'{config}'::regconfig")
+
+
 class SearchFilterMixin:
     def build_search_filters(
         self, class_name: Type[T], stmt: Select[V], search: Iterable[SQLGenericSearch]
     ) -> Select[V]:
+        ranks: List[ColumnElement[float]] = []
         for values in search:
-            if values.use_ilike:
-                stmt = stmt.where(getattr(class_name, values.field.value).ilike(f"%{values.value}%"))
+            column = getattr(class_name, values.field.value)
+            mode = values.search_mode
+            if mode == SearchMode.full_text:
+                document = func.to_tsvector(text_search_config(), column)
+                query = func.websearch_to_tsquery(text_search_config(), values.value)
+                stmt = stmt.where(document.op("@@")(query))
+                if values.rank:
+                    ranks.append(func.ts_rank(document, query))
+            elif mode == SearchMode.trigram:
+                stmt = stmt.where(column.op("%>")(values.value))
+                if values.rank:
+                    ranks.append(func.word_similarity(values.value, column))
+            elif mode == SearchMode.ilike:
+                stmt = stmt.where(column.ilike(f"%{values.value}%"))
             else:
-                stmt = stmt.where(getattr(class_name, values.field.value) == values.value)
+                stmt = stmt.where(column == values.value)
+
+        if ranks:
+            rank: ColumnElement[float] = reduce(operator.add, ranks)
+            stmt = stmt.order_by(rank.desc())
 
         return stmt
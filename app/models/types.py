@@ -1,11 +1,29 @@
+from enum import Enum
 from typing import Generic, TypeVar
 
 from pydantic import BaseModel
 
 Z = TypeVar("Z")
 
+TEXT_SEARCH_CONFIG = "simple"
+
+
+class SearchMode(Enum):
+    exact = "exact"
+    ilike = "ilike"
+    trigram = "trigram"
+    full_text = "full_text"
+
 
 class SQLGenericSearch(BaseModel, Generic[Z]):
     field: Z
     value: str
     use_ilike: bool = False
+    mode: SearchMode | None = None
+    rank: bool = False
+
+    @property
+    def search_mode(self) -> SearchMode:
+        if self.mode is not None:
+            return self.mode
+        return SearchMode.ilike if self.use_ilike else SearchMode.exact
@@ -1,14 +1,23 @@
-from contextlib import AsyncContextDecorator, asynccontextmanager
+import json
+from contextlib import AsyncContextDecorator, asynccontextmanager, contextmanager
 from contextvars import ContextVar
 from copy import copy
 from dataclasses import dataclass, field
-from typing import Any, List, TypeVar
+from itertools import cycle
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import uuid4
 
-from sqlalchemy.engine import Result
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import ARRAY, Column, MetaData, Table, any_, bindparam, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Result, Row
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession, async_sessionmaker
+from sqlalchemy.schema import CreateTable, DropTable
+from sqlalchemy.sql.expression import Select
 from sqlalchemy.sql.selectable import TypedReturnsRows
 
+from app.core.page_info import CountMode
 from app.models.base_model import Base
+from app.models.keyset_pagination_mixin import KeysetPaginationMixin
 from app.models.search_filter_mixin import SearchFilterMixin
 
 T = TypeVar("T", bound=Base)
@@ -17,6 +26,53 @@ V = TypeVar("V", bound=Any)
 session_ctx: ContextVar[AsyncSession] = ContextVar("session_ctx")
 
 
+@dataclass
+class _PrimaryPin:
+    pinned: bool = False
+
+
+_primary_pin: ContextVar[Optional[_PrimaryPin]] = ContextVar("primary_pin", default=None)
+_read_replicas: Dict[async_sessionmaker[AsyncSession], Iterator[async_sessionmaker[AsyncSession]]] = {}
+
+
+def register_read_replicas(
+    primary: async_sessionmaker[AsyncSession], replicas: Sequence[async_sessionmaker[AsyncSession]]
+):
+    if replicas:
+        _read_replicas[primary] = cycle(replicas)
+    else:
+        _read_replicas.pop(primary, None)
+
+
+@contextmanager
+def request_routing_scope():
+    """Reads inside the scope may go to a replica until the first write, after which they stay on the primary."""
+    token = _primary_pin.set(_PrimaryPin())
+    try:
+        yield
+    finally:
+        _primary_pin.reset(token)
+
+
+def _is_read_only(stmt: Any) -> bool:
+    return isinstance(stmt, Select) and stmt._for_update_arg is None
+
+
+def _column_names(rows: Sequence[Dict[str, Any]]) -> List[str]:
+    names = list(rows[0])
+    expected = set(names)
+    for index, row in enumerate(rows):
+        if row.keys() != expected:
+            raise ValueError(f"Row {index} has the columns {sorted(row)}, every row must have {sorted(expected)}.")
+    return names
+
+
+def _pin_primary():
+    pin = _primary_pin.get()
+    if pin is not None:
+        pin.pinned = True
+
+
 @dataclass
 class transaction(AsyncContextDecorator):
     session_maker: async_sessionmaker[AsyncSession]
@@ -39,8 +95,10 @@ class transaction(AsyncContextDecorator):
 
 
 @dataclass
-class SqlBaseRepository(SearchFilterMixin):
+class SqlBaseRepository(SearchFilterMixin, KeysetPaginationMixin):
     db: async_sessionmaker[AsyncSession]
+    copy_threshold: int = 10_000
+    stream_fetch_size: int = 1_000
 
     async def create_or_update(self, model: T):  # pyright: ignore [reportInvalidTypeVarUse]
         async with self._get_session() as session:
@@ -54,6 +112,124 @@ class SqlBaseRepository(SearchFilterMixin):
         async with self._get_session() as session:
             session.add_all(models)
 
+    async def bulk_insert(self, class_name: Type[T], rows: Sequence[Dict[str, Any]]):
+        if not rows:
+            return
+        table: Table = class_name.__table__  # pyright: ignore [reportAssignmentType]
+        names = _column_names(rows)
+        async with self._get_session() as session:
+            if len(rows) >= self.copy_threshold:
+                columns, records = self._copy_records(session, table, names, rows)
+                await self._copy_to_table(session, table, columns, records)
+            else:
+                await session.execute(insert(table), rows)
+
+    async def bulk_upsert(
+        self,
+        class_name: Type[T],
+        rows: Sequence[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ):
+        if not rows:
+            return
+        table: Table = class_name.__table__  # pyright: ignore [reportAssignmentType]
+        names = _column_names(rows)
+        if update_columns is None:
+            update_columns = [name for name in names if name not in index_elements]
+
+        async with self._get_session() as session:
+            staging = None
+            if len(rows) >= self.copy_threshold:
+                columns, records = self._copy_records(session, table, names, rows)
+                staging = Table(
+                    f"{table.name}_staging_{uuid4().hex}",
+                    MetaData(),
+                    *(Column(name, table.c[name].type) for name in columns),
+                    prefixes=["TEMPORARY"],
+                    postgresql_on_commit="DROP",
+                )
+                await session.execute(CreateTable(staging))
+                await self._copy_to_table(session, staging, columns, records)
+                stmt = pg_insert(table).from_select(columns, select(staging))
+            else:
+                stmt = pg_insert(table)
+
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements, set_={name: stmt.excluded[name] for name in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+            if staging is None:
+                await session.execute(stmt, list(rows))
+            else:
+                await session.execute(stmt)
+                await session.execute(DropTable(staging))
+
+    async def _copy_to_table(
+        self, session: AsyncSession, table: Table, columns: List[str], records: List[Tuple[Any, ...]]
+    ):
+        connection = await session.connection()
+        # COPY goes straight to asyncpg: make sure the session transaction is opened on the driver first.
+        await connection.exec_driver_sql("SELECT 1")
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+
+    def _copy_records(
+        self, session: AsyncSession, table: Table, names: List[str], rows: Sequence[Dict[str, Any]]
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        # COPY skips SQLAlchemy, so python-side defaults and bind processors are applied here.
+        defaults: List[Any] = [
+            column.default
+            for column in table.columns
+            if column.name not in names
+            and column.default is not None
+            and (column.default.is_scalar or column.default.is_callable)
+        ]
+        columns = [*names, *(default.column.name for default in defaults)]
+        dialect = session.get_bind().dialect
+        processors = [table.c[name].type.bind_processor(dialect) for name in columns]
+
+        records = []
+        for row in rows:
+            values = [row[name] for name in names]
+            values.extend(default.arg if default.is_scalar else default.arg(None) for default in defaults)
+            records.append(
+                tuple(processor(value) if processor else value for value, processor in zip(values, processors))
+            )
+        return columns, records
+
+    async def get_by_ids(self, class_name: Type[T], ids: Sequence[Any], column: str = "id") -> List[T]:
+        attribute = getattr(class_name, column)
+        stmt = select(class_name).where(attribute == any_(bindparam("ids", list(ids), type_=ARRAY(attribute.type))))
+        result = await self._exec_statement(stmt)
+        return list(result.scalars().all())
+
+    async def count(self, stmt: Select[Any], mode: CountMode = CountMode.exact, cap: Optional[int] = None) -> int:
+        stmt = stmt.order_by(None)
+        if mode == CountMode.estimated:
+            return await self._estimate_count(stmt)
+        if mode == CountMode.capped:
+            if cap is None:
+                raise ValueError("A cap is required to count in capped mode.")
+            stmt = stmt.limit(cap)
+        result = await self._exec_statement(select(func.count()).select_from(stmt.subquery()))
+        return result.scalar_one()
+
+    async def _estimate_count(self, stmt: Select[Any]) -> int:
+        async with self._get_session(read_only=True) as session:
+            compiled = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+            result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def commit(self):
         async with self._get_session() as session:
             await session.commit()
@@ -63,7 +239,9 @@ class SqlBaseRepository(SearchFilterMixin):
             await session.rollback()
 
     @asynccontextmanager
-    async def _get_session(self):
+    async def _get_session(self, read_only: bool = False):
+        if not read_only:
+            _pin_primary()
         try:
             yield session_ctx.get()
         except LookupError:
@@ -71,6 +249,44 @@ class SqlBaseRepository(SearchFilterMixin):
                 yield session
                 await session.commit()
 
+    def _read_replica(self, stmt: Any) -> Optional[async_sessionmaker[AsyncSession]]:
+        pin = _primary_pin.get()
+        if pin is None or pin.pinned or self.db not in _read_replicas or session_ctx.get(None) is not None:
+            return None
+        if not _is_read_only(stmt):
+            return None
+        return next(_read_replicas[self.db])
+
+    async def stream(self, stmt: Select[Any], fetch_size: Optional[int] = None) -> AsyncGenerator[Row[Any], None]:
+        """Rows come from a server-side cursor, `fetch_size` at a time, and the session stays open until the
+        iteration ends or the generator is closed."""
+        async with self._stream_statement(stmt, fetch_size) as result:
+            async for row in result:
+                yield row
+
+    async def stream_chunks(
+        self, stmt: Select[Any], fetch_size: Optional[int] = None, scalars: bool = False
+    ) -> AsyncGenerator[Sequence[Any], None]:
+        async with self._stream_statement(stmt, fetch_size) as result:
+            source = result.scalars() if scalars else result
+            async for chunk in source.partitions():
+                yield chunk
+
+    @asynccontextmanager
+    async def _stream_statement(self, stmt: Select[Any], fetch_size: Optional[int]) -> AsyncIterator[AsyncResult[Any]]:
+        stmt = stmt.execution_options(yield_per=fetch_size or self.stream_fetch_size)
+        replica = self._read_replica(stmt)
+        if replica is not None:
+            async with replica() as session:
+                yield await session.stream(stmt)
+            return
+        async with self._get_session(read_only=_is_read_only(stmt)) as session:
+            yield await session.stream(stmt)
+
     async def _exec_statement(self, stmt: TypedReturnsRows[V]) -> Result[V]:
-        async with self._get_session() as session:
+        replica = self._read_replica(stmt)
+        if replica is not None:
+            async with replica() as session:
+                return await session.execute(stmt)
+        async with self._get_session(read_only=_is_read_only(stmt)) as session:
             return await session.execute(stmt)
@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+# Imported first by main.py, so the time until startup_report() is called covers the whole boot.
+_started = perf_counter()
+startup_phases: Dict[str, float] = {}
+_shutdown_callbacks: List[Callable[[], Any]] = []
+
+
+@contextmanager
+def startup_phase(name: str):
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        startup_phases[name] = startup_phases.get(name, 0.0) + perf_counter() - started
+
+
+def startup_report() -> Dict[str, float]:
+    total = perf_counter() - _started
+    report = {f"{name}_ms": round(seconds * 1000, 1) for name, seconds in startup_phases.items()}
+    report["other_imports_ms"] = round((total - sum(startup_phases.values())) * 1000, 1)
+    report["total_ms"] = round(total * 1000, 1)
+    return report
+
+
+def on_shutdown(callback: Callable[[], Any]):
+    """Lets lazily initialized dependencies register their cleanup with the application lifespan."""
+    _shutdown_callbacks.append(callback)
+
+
+async def run_shutdown_callbacks():
+    while _shutdown_callbacks:
+        result = _shutdown_callbacks.pop()()
+        if isawaitable(result):
+            await result
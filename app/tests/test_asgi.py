@@ -0,0 +1,148 @@
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import Receive, Scope, Send
+
+from app.core.asgi import RequestPipelineMiddleware
+from app.core.logging import DEFAULT_CORRELATION_ID, QUIET_PATHS, logger
+
+ORIGIN = "http://localhost:3000"
+
+CONFIGURATIONS: List[Dict[str, Any]] = [
+    {
+        "allow_origins": [ORIGIN],
+        "allow_credentials": True,
+        "allow_methods": ["*"],
+        "allow_headers": ["*"],
+    },
+    {"allow_origins": ["*"], "allow_credentials": True, "expose_headers": ["X-Total"]},
+    {"allow_origin_regex": r"https://.*\.example\.com", "allow_methods": ["GET", "POST"], "allow_headers": ["X-Token"]},
+]
+
+REQUESTS: List[Tuple[str, Dict[str, str]]] = [
+    ("GET", {}),
+    ("GET", {"origin": ORIGIN}),
+    ("GET", {"origin": "https://app.example.com"}),
+    ("GET", {"origin": "https://evil.test"}),
+    ("GET", {"origin": ORIGIN, "cookie": "session=1"}),
+    ("OPTIONS", {"origin": ORIGIN, "access-control-request-method": "POST"}),
+    ("OPTIONS", {"origin": "https://app.example.com", "access-control-request-method": "POST"}),
+    ("OPTIONS", {"origin": "https://evil.test", "access-control-request-method": "POST"}),
+    ("OPTIONS", {"origin": ORIGIN, "access-control-request-method": "PATCH"}),
+    (
+        "OPTIONS",
+        {"origin": ORIGIN, "access-control-request-method": "GET", "access-control-request-headers": "X-Token"},
+    ),
+    (
+        "OPTIONS",
+        {"origin": ORIGIN, "access-control-request-method": "GET", "access-control-request-headers": "X-Other"},
+    ),
+    ("OPTIONS", {}),
+]
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"endpoint"})
+
+
+async def _exchange(app, method: str, headers: Dict[str, str]):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.request(method, "/", headers=headers)
+    cors_headers = {
+        name: value for name, value in response.headers.items() if name.startswith("access-control-") or name == "vary"
+    }
+    return response.status_code, response.text, cors_headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("configuration", CONFIGURATIONS)
+@pytest.mark.parametrize("method, headers", REQUESTS)
+async def test_cors_matches_starlette(configuration, method, headers):
+    pipeline = RequestPipelineMiddleware(_endpoint, path_rewrites={}, **configuration)
+    starlette = CORSMiddleware(_endpoint, **configuration)
+
+    assert await _exchange(pipeline, method, headers) == await _exchange(starlette, method, headers)
+
+
+@pytest.mark.asyncio
+async def test_path_rewrite():
+    seen = []
+
+    async def app(scope: Scope, receive: Receive, send: Send):
+        seen.append((scope["path"], scope["raw_path"]))
+        await _endpoint(scope, receive, send)
+
+    pipeline = RequestPipelineMiddleware(app, path_rewrites={"/graphql": "/graphql/"})
+    async with AsyncClient(transport=ASGITransport(app=pipeline), base_url="http://testserver") as client:
+        await client.get("/graphql")
+
+    assert seen == [("/graphql/", b"/graphql/")]
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_and_step_are_echoed(client):
+    response = await client.post(
+        "/graphql", json={"query": "{ testQuery }"}, headers={"correlation_id": "request-1", "step": "3"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["correlation_id"] == "request-1"
+    assert response.headers["step"] == "3"
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+@pytest.mark.asyncio
+async def test_default_correlation_id_and_step(client):
+    response = await client.get("/health_check")
+
+    assert response.headers["correlation_id"] == DEFAULT_CORRELATION_ID
+    assert response.headers["step"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_preflight_from_allowed_origin(client):
+    response = await client.options(
+        "/graphql/",
+        headers={"origin": ORIGIN, "access-control-request-method": "POST", "access-control-request-headers": "x-a"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "x-a"
+    assert response.headers["correlation_id"]
+
+
+@pytest.mark.asyncio
+async def test_preflight_from_unknown_origin_is_rejected(client):
+    response = await client.options(
+        "/graphql/", headers={"origin": "https://evil.test", "access-control-request-method": "POST"}
+    )
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS origin"
+    assert "access-control-allow-origin" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_simple_request_from_allowed_origin(client):
+    response = await client.post("/graphql/", json={"query": "{ testQuery }"}, headers={"origin": ORIGIN})
+
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "Origin" in response.headers["vary"]
+
+
+@pytest.mark.asyncio
+async def test_quiet_paths_are_not_logged(monkeypatch):
+    logged = []
+    monkeypatch.setattr(logger, "info", lambda msg, extra: logged.append(extra["path"]))
+    pipeline = RequestPipelineMiddleware(_endpoint, path_rewrites={}, quiet_paths=QUIET_PATHS)
+    async with AsyncClient(transport=ASGITransport(app=pipeline), base_url="http://testserver") as client:
+        for path in ("/health_check", "/health_check/ready", "/graphql/"):
+            await client.get(path)
+
+    assert logged == ["/graphql/"]
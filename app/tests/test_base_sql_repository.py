@@ -0,0 +1,213 @@
+import json
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+import pytest
+from sqlalchemy import JSON, Column, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable, DropTable
+
+from app.core.page_info import CountMode
+from app.repositories.base_sql_repository import SqlBaseRepository, session_ctx
+
+DIALECT = postgresql.asyncpg.dialect()  # pyright: ignore [reportAttributeAccessIssue]
+
+
+class _Item:
+    __table__ = Table(
+        "item",
+        MetaData(),
+        Column("id", Integer(), primary_key=True),
+        Column("name", String()),
+        Column("payload", JSON()),
+        Column("status", String(), default="new"),
+        Column("version", Integer(), default=lambda: 1),
+    )
+
+
+class _Result:
+    def __init__(self, value: Any):
+        self.value = value
+
+    def scalar_one(self) -> Any:
+        return self.value
+
+
+class _StreamResult:
+    def __init__(self, rows: Sequence[Any], size: int):
+        self.rows = rows
+        self.size = size
+
+    def scalars(self) -> "_StreamResult":
+        return _StreamResult([row[0] for row in self.rows], self.size)
+
+    async def partitions(self) -> AsyncIterator[Sequence[Any]]:
+        for start in range(0, len(self.rows), self.size):
+            yield self.rows[start : start + self.size]
+
+
+class _Session:
+    """Records statements and COPY calls, the asyncpg connection is the session itself."""
+
+    def __init__(self, result: Any = None, rows: Sequence[Any] = ()):
+        self.result = result
+        self.rows = rows
+        self.executed: List[Any] = []
+        self.copied: List[Any] = []
+
+    async def execute(self, stmt: Any, params: Optional[Any] = None) -> _Result:
+        self.executed.append((stmt, params))
+        return _Result(self.result)
+
+    async def stream(self, stmt: Any) -> _StreamResult:
+        self.executed.append((stmt, None))
+        return _StreamResult(self.rows, stmt.get_execution_options()["yield_per"])
+
+    def get_bind(self):
+        return self
+
+    @property
+    def dialect(self):
+        return DIALECT
+
+    async def connection(self):
+        return self
+
+    async def exec_driver_sql(self, sql: str):
+        pass
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self):
+        return self
+
+    async def copy_records_to_table(self, table_name: str, records: list, columns: list, schema_name: Optional[str]):
+        self.copied.append((table_name, columns, records))
+
+
+def _sql(stmt: Any) -> str:
+    return " ".join(str(stmt.compile(dialect=DIALECT)).split())
+
+
+@pytest.fixture
+def session():
+    session = _Session()
+    token = session_ctx.set(session)  # type: ignore
+    yield session
+    session_ctx.reset(token)
+
+
+@pytest.fixture
+def repository():
+    return SqlBaseRepository(None, copy_threshold=3, stream_fetch_size=2)  # type: ignore
+
+
+def _rows(count: int):
+    return [{"id": index, "name": f"item {index}", "payload": {"index": index}} for index in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_below_the_threshold_uses_executemany(repository, session):
+    await repository.bulk_insert(_Item, _rows(2))
+
+    [(stmt, params)] = session.executed
+    assert _sql(stmt).startswith("INSERT INTO item")
+    assert params == _rows(2)
+    assert session.copied == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_copies_with_defaults_and_bind_processors(repository, session):
+    await repository.bulk_insert(_Item, _rows(3))
+
+    assert session.executed == []
+    [(table_name, columns, records)] = session.copied
+    assert table_name == "item"
+    assert columns == ["id", "name", "payload", "status", "version"]
+    assert records[2][:2] == (2, "item 2")
+    assert json.loads(records[2][2]) == {"index": 2}
+    assert records[2][3:] == ("new", 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [2, 3])
+async def test_bulk_insert_rejects_rows_with_other_columns(repository, session, count):
+    rows = _rows(count)
+    del rows[-1]["payload"]
+
+    with pytest.raises(ValueError, match=f"Row {count - 1} has the columns"):
+        await repository.bulk_insert(_Item, rows)
+    assert session.executed == session.copied == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_below_the_threshold(repository, session):
+    await repository.bulk_upsert(_Item, _rows(2), index_elements=["id"])
+
+    [(stmt, params)] = session.executed
+    assert "ON CONFLICT (id) DO UPDATE SET name = excluded.name, payload = excluded.payload" in _sql(stmt)
+    assert params == _rows(2)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_copies_through_a_staging_table(repository, session):
+    await repository.bulk_upsert(_Item, _rows(3), index_elements=["id"], update_columns=[])
+
+    create, upsert, drop = (stmt for stmt, _ in session.executed)
+    [(staging_name, columns, _)] = session.copied
+    assert isinstance(create, CreateTable) and isinstance(drop, DropTable)
+    assert create.element.name == drop.element.name == staging_name
+    assert staging_name.startswith("item_staging_")
+    assert columns == ["id", "name", "payload", "status", "version"]
+    assert _sql(upsert).startswith(f"INSERT INTO item (id, name, payload, status, version) SELECT {staging_name}.id")
+    assert _sql(upsert).endswith("ON CONFLICT (id) DO NOTHING")
+
+
+@pytest.mark.asyncio
+async def test_exact_count_drops_the_ordering(repository, session):
+    session.result = 7
+
+    assert await repository.count(select(_Item.__table__).order_by(_Item.__table__.c.name)) == 7
+
+    [(stmt, _)] = session.executed
+    assert _sql(stmt).startswith("SELECT count(*) AS count_1 FROM (SELECT item.id")
+    assert "ORDER BY" not in _sql(stmt)
+
+
+@pytest.mark.asyncio
+async def test_capped_count_limits_the_subquery(repository, session):
+    session.result = 5
+
+    assert await repository.count(select(_Item.__table__), CountMode.capped, cap=5) == 5
+
+    [(stmt, _)] = session.executed
+    assert "LIMIT $1::INTEGER) AS anon_1" in _sql(stmt)
+
+
+@pytest.mark.asyncio
+async def test_capped_count_needs_a_cap(repository, session):
+    with pytest.raises(ValueError):
+        await repository.count(select(_Item.__table__), CountMode.capped)
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_reads_the_plan(repository, session):
+    session.result = json.dumps([{"Plan": {"Plan Rows": 1200}}])
+
+    assert await repository.count(select(_Item.__table__).where(_Item.__table__.c.id > 3), CountMode.estimated) == 1200
+
+    [(stmt, _)] = session.executed
+    assert str(stmt).startswith("EXPLAIN (FORMAT JSON) SELECT item.id")
+    assert "item.id > 3" in str(stmt)
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks(repository, session):
+    session.rows = [(index, f"item {index}") for index in range(5)]
+
+    chunks = [chunk async for chunk in repository.stream_chunks(select(_Item.__table__))]
+    ids = [chunk async for chunk in repository.stream_chunks(select(_Item.__table__), fetch_size=3, scalars=True)]
+
+    assert chunks == [session.rows[0:2], session.rows[2:4], session.rows[4:5]]
+    assert ids == [[0, 1, 2], [3, 4]]
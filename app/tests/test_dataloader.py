@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List, Sequence
+
+import pytest
+
+from app.core.dataloader import DataLoader, LoaderRegistry
+from app.repositories.base_sql_repository import SqlBaseRepository
+
+
+class _Repository(SqlBaseRepository):
+    def __init__(self, models: Sequence[Any]):
+        super().__init__(None)  # type: ignore
+        self.models = models
+        self.calls: List[Any] = []
+
+    async def get_by_ids(self, class_name, ids, column="id"):
+        self.calls.append((class_name, list(ids), column))
+        # Like a database that coerces the keys, rows may come back with keys that were not asked for.
+        return list(self.models)
+
+
+class _Book:
+    pass
+
+
+BOOKS = [
+    SimpleNamespace(id=1, author_id=10),
+    SimpleNamespace(id=2, author_id=10),
+    SimpleNamespace(id=3, author_id=20),
+]
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_are_batched():
+    batches = []
+
+    async def batch_load(keys: List[int]) -> List[int]:
+        batches.append(keys)
+        return [key * 2 for key in keys]
+
+    loader = DataLoader(batch_load, max_batch_size=2)
+
+    assert await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3)) == [2, 4, 2, 6]
+    assert batches == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_values_are_cached_until_cleared():
+    batches = []
+
+    async def batch_load(keys: List[int]) -> List[int]:
+        batches.append(keys)
+        return keys
+
+    loader = DataLoader(batch_load)
+    loader.prime(5, 50)
+
+    assert await loader.load_many([1, 5]) == [1, 50]
+    assert await loader.load(1) == 1
+    loader.clear(1)
+    assert await loader.load(1) == 1
+    assert batches == [[1], [1]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("result", [RuntimeError("database is down"), [1]])
+async def test_a_failed_batch_fails_every_waiting_load(result):
+    async def batch_load(keys: List[int]) -> List[int]:
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    loader = DataLoader(batch_load)
+    futures = [loader.load(key) for key in (1, 2, 3)]
+
+    outcomes = await asyncio.gather(*futures, return_exceptions=True)
+
+    assert all(isinstance(outcome, Exception) for outcome in outcomes)
+    assert len({id(outcome) for outcome in outcomes}) == 1
+    assert loader._cache == {}
+
+
+@pytest.mark.asyncio
+async def test_model_loaders():
+    repository = _Repository(BOOKS)
+    registry = LoaderRegistry()
+
+    books = registry.model_loader(repository, _Book)  # type: ignore
+    by_author = registry.model_list_loader(repository, _Book, "author_id")  # type: ignore
+
+    assert await books.load_many([3, 4, 1]) == [BOOKS[2], None, BOOKS[0]]
+    assert await by_author.load_many([10, 30, 20]) == [BOOKS[:2], [], [BOOKS[2]]]
+    assert repository.calls == [(_Book, [3, 4, 1], "id"), (_Book, [10, 30, 20], "author_id")]
+
+
+@pytest.mark.asyncio
+async def test_model_list_loader_ignores_models_with_unrequested_keys():
+    repository = _Repository([SimpleNamespace(id=1, author_id="10")])
+    loader = LoaderRegistry().model_list_loader(repository, _Book, "author_id")  # type: ignore
+
+    assert await loader.load(10) == []
+
+
+@pytest.mark.asyncio
+async def test_registry_keeps_one_loader_per_repository_model_and_column():
+    registry = LoaderRegistry()
+    repository, other_repository = _Repository(BOOKS), _Repository(BOOKS)
+
+    loader = registry.model_loader(repository, _Book)  # type: ignore
+
+    assert registry.model_loader(repository, _Book) is loader  # type: ignore
+    assert registry.model_loader(other_repository, _Book) is not loader  # type: ignore
+    assert registry.model_loader(repository, _Book, "author_id") is not loader  # type: ignore
+    assert registry.model_list_loader(repository, _Book, "id") is not loader  # type: ignore
+    assert len({id(loader.lock) for loader in registry._loaders.values()}) == 1
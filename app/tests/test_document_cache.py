@@ -0,0 +1,115 @@
+from hashlib import sha256
+from typing import Any, List
+
+import pytest
+from graphql import ASTValidationRule, build_schema, specified_rules
+
+from app.graphql import document_cache as document_cache_module
+from app.graphql.document_cache import DocumentCache
+
+SCHEMA = build_schema("type Query { name: String }")
+
+
+class _RequestRule(ASTValidationRule):
+    """Stands for the rules that depend on the request, like the query cost limits."""
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    calls: List[Any] = []
+    validate = document_cache_module.validate
+
+    def recording_validate(schema, document_ast, rules=None, *args):
+        calls.append(tuple(rules or ()))
+        return validate(schema, document_ast, rules, *args)
+
+    monkeypatch.setattr(document_cache_module, "validate", recording_validate)
+    return calls
+
+
+def test_parsed_documents_are_kept_for_the_most_recent_queries():
+    cache = DocumentCache(max_size=2)
+    first = cache.parse(None, {"query": "{ a }"})
+    cache.parse(None, {"query": "{ b }"})
+
+    assert cache.parse(None, {"query": "{ a }"}) is first
+    cache.parse(None, {"query": "{ c }"})
+
+    assert cache.parse(None, {"query": "{ a }"}) is first
+    assert list(cache._entries) == ["{ c }", "{ a }"]
+    assert len(cache._by_document) == 2
+
+
+def test_cached_validation_still_runs_the_request_rules(validations):
+    cache = DocumentCache(max_size=2)
+    document = cache.parse(None, {"query": "{ name }"})
+    rules = [*specified_rules, _RequestRule]
+
+    assert cache.validate(SCHEMA, document, rules) == []
+    assert cache.validate(SCHEMA, document, rules) == []
+
+    assert validations == [tuple(specified_rules), (_RequestRule,), (_RequestRule,)]
+
+
+def test_cached_errors_skip_the_request_rules(validations):
+    cache = DocumentCache(max_size=2)
+    document = cache.parse(None, {"query": "{ unknown }"})
+    rules = [*specified_rules, _RequestRule]
+
+    first = cache.validate(SCHEMA, document, rules)
+    second = cache.validate(SCHEMA, document, rules)
+
+    assert [error.message for error in first] == ["Cannot query field 'unknown' on type 'Query'."]
+    assert second == first and second is not first
+    assert validations == [tuple(specified_rules)]
+
+
+def test_documents_parsed_elsewhere_are_validated_in_full(validations):
+    cache = DocumentCache(max_size=2)
+    other_cache = DocumentCache(max_size=2)
+    document = other_cache.parse(None, {"query": "{ name }"})
+
+    cache.validate(SCHEMA, document, [*specified_rules, _RequestRule])
+    cache.validate(SCHEMA, document, [*specified_rules, _RequestRule])
+
+    assert validations == [(*specified_rules, _RequestRule)] * 2
+
+
+def _persisted_query(query: str, query_hash: str | None = None):
+    return {"version": 1, "sha256Hash": query_hash or sha256(query.encode("utf-8")).hexdigest()}
+
+
+@pytest.mark.asyncio
+async def test_unknown_persisted_query_asks_for_the_query_text(client):
+    extensions = {"persistedQuery": _persisted_query("query Unknown { testQuery }")}
+
+    response = await client.post("/graphql/", json={"extensions": extensions})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "errors": [{"message": "PersistedQueryNotFound", "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_persisted_query_with_another_hash_is_rejected(client):
+    query = "query Mismatch { testQuery }"
+    extensions = {"persistedQuery": _persisted_query(query, sha256(b"other").hexdigest())}
+
+    response = await client.post("/graphql/", json={"query": query, "extensions": extensions})
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["extensions"] == {"code": "BAD_USER_INPUT"}
+
+
+@pytest.mark.asyncio
+async def test_registered_persisted_query_is_served_by_hash(client):
+    query = "query Registered { testQuery }"
+    extensions = {"persistedQuery": _persisted_query(query)}
+
+    registered = await client.post("/graphql/", json={"query": query, "extensions": extensions})
+    hit = await client.post("/graphql/", json={"extensions": extensions})
+
+    assert registered.status_code == hit.status_code == 200
+    assert hit.json() == registered.json()
+    assert "errors" not in hit.json()
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import encryptions, ms_config
+from app.core.encryptions import (
+    PasswordHashingStatistics,
+    hash_password,
+    hash_password_async,
+    verify_and_update_password,
+    verify_and_update_password_async,
+    verify_password_async,
+)
+
+
+class _FakeBcrypt:
+    """Reversible stand-in for passlib's bcrypt handler, hashes look like "$fake$<rounds>$<password>"."""
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def using(self, rounds: int) -> "_FakeBcrypt":
+        return _FakeBcrypt(rounds)
+
+    def hash(self, password: str) -> str:
+        return f"$fake${self.rounds}${password}"
+
+    def verify(self, password: str, hash: str) -> bool:
+        return hash.split("$", 3)[3] == password
+
+    def from_string(self, hash: str):
+        return SimpleNamespace(rounds=int(hash.split("$", 3)[2]))
+
+
+@pytest.fixture
+def statistics(monkeypatch):
+    # Threads see the patched module, a spawned process would import the real bcrypt again.
+    monkeypatch.setattr(encryptions, "bcrypt", _FakeBcrypt())
+    monkeypatch.setattr(encryptions, "password_hashing_statistics", PasswordHashingStatistics())
+    monkeypatch.setattr(ms_config.passwords, "bcrypt_rounds", 10)
+    monkeypatch.setattr(ms_config.passwords, "max_concurrent_hashes", 2)
+    encryptions.shutdown_password_executor()
+    encryptions._executor = ThreadPoolExecutor(max_workers=8)  # type: ignore
+    yield encryptions.password_hashing_statistics
+    encryptions.shutdown_password_executor()
+
+
+def test_verify_and_update_password(monkeypatch):
+    monkeypatch.setattr(encryptions, "bcrypt", _FakeBcrypt())
+    hash = hash_password("secret", rounds=10)
+
+    assert verify_and_update_password("wrong", hash, rounds=10) == (False, None)
+    assert verify_and_update_password("secret", hash, rounds=10) == (True, None)
+    assert verify_and_update_password("secret", hash, rounds=12) == (True, hash_password("secret", rounds=12))
+
+
+@pytest.mark.asyncio
+async def test_async_helpers_use_the_configured_rounds(statistics):
+    hash = await hash_password_async("secret")
+
+    assert hash == hash_password("secret", rounds=10)
+    assert await verify_password_async("secret", hash)
+    assert not await verify_password_async("wrong", hash)
+    assert await verify_and_update_password_async("secret", hash) == (True, None)
+    assert await verify_and_update_password_async("secret", hash, rounds=12) == (True, hash_password("secret", 12))
+    assert statistics.calls == 5
+    assert statistics.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_hashes_are_bounded(statistics):
+    lock = threading.Lock()
+    running = peak = 0
+
+    def slow_hash(password: str) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return password
+
+    results = await asyncio.gather(*(encryptions._run_in_process(slow_hash, str(index)) for index in range(6)))
+
+    assert results == [str(index) for index in range(6)]
+    assert peak == 2
+    assert statistics.calls == 6
+    assert statistics.waiting == 0
+    assert statistics.queue_seconds_max >= 0.05
+    assert statistics.queue_seconds_total >= statistics.queue_seconds_max
+
+
+@pytest.mark.asyncio
+async def test_statistics_are_exported(statistics, client):
+    await hash_password_async("secret")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert any(line.startswith("password_hashing_calls_total{") and line.endswith(" 1.0") for line in lines)
+    assert any(line.startswith("password_hashing_waiting{") for line in lines)
+    assert any(line.startswith("password_hashing_queue_seconds_max{") for line in lines)
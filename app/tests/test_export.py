@@ -0,0 +1,90 @@
+import asyncio
+import time
+from typing import Any, List
+
+import pytest
+from sqlalchemy import column, select, table
+
+from app.core import ms_config
+from app.core.encryptions import sign_jwt_dict
+from app.views import export
+
+ROWS = table("rows", column("id"), column("name"))
+
+
+class _Row(tuple):
+    def _asdict(self):
+        return {"id": self[0], "name": self[1]}
+
+
+@pytest.fixture
+def streamed(monkeypatch):
+    events: List[str] = []
+
+    async def stream_chunks(stmt, fetch_size=None):
+        try:
+            for index in range(3):
+                yield [_Row((index, f"row {index}"))]
+        finally:
+            events.append("closed")
+
+    monkeypatch.setattr(export.repository, "stream_chunks", stream_chunks)
+    monkeypatch.setitem(
+        export._exports, "rows", export._Export(lambda: select(ROWS), lambda payload: payload.get("role") == "admin")
+    )
+    return events
+
+
+def _bearer(**claims: Any):
+    token = sign_jwt_dict({**claims, "exp": int(time.time()) + 60, "iss": ms_config.jwt.issuer})
+    return {"authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_export_requires_a_token(client, streamed):
+    response = await client.get("/export/rows")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_export_checks_the_registered_permission(client, streamed):
+    response = await client.get("/export/rows", headers=_bearer(role="user"))
+
+    assert response.status_code == 403
+    assert streamed == []
+
+
+@pytest.mark.asyncio
+async def test_export_streams_rows_and_closes_the_stream(client, streamed):
+    response = await client.get("/export/rows", params={"format": "csv"}, headers=_bearer(role="admin"))
+
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["id,name", "0,row 0", "1,row 1", "2,row 2"]
+    assert streamed == ["closed"]
+
+
+@pytest.mark.asyncio
+async def test_export_closes_the_stream_when_the_client_disconnects():
+    events: List[str] = []
+
+    async def chunks():
+        try:
+            while True:
+                yield [_Row((0, "row"))]
+        finally:
+            events.append("closed")
+
+    rows = chunks()
+    response = export._ExportResponse(export._ndjson_lines(rows), rows)
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        await asyncio.sleep(0)
+
+    await response({"type": "http"}, receive, send)
+
+    assert events == ["closed"]
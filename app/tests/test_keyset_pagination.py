@@ -0,0 +1,109 @@
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Column, Integer, Uuid, select
+
+from app.core.exceptions import BadUserInputError
+from app.core.page_info import KeysetPaginationInfoDto
+from app.core.pagination import get_relay_keyset_cursor, paginate
+from app.models.base_model import Base
+from app.models.keyset_pagination_mixin import KeysetPaginationMixin
+
+
+class _Row:
+    rank = Column("rank", Integer())
+    id = Column("id", Uuid())
+
+
+ROWS: List[Dict[str, Any]] = [{"rank": rank, "id": uuid4()} for rank in range(1, 8)]
+
+
+async def _page(pagination_dto: KeysetPaginationInfoDto):
+    keys = [(row["rank"], str(row["id"])) for row in ROWS]
+    rows = list(zip(keys, ROWS))
+    if pagination_dto.values is not None:
+        value = (pagination_dto.values[0], str(pagination_dto.values[1]))
+        rows = [(key, row) for key, row in rows if (key < value if pagination_dto.backward else key > value)]
+    if pagination_dto.backward:
+        rows.reverse()
+    return [row for _, row in rows[: pagination_dto.limit + 1]], len(ROWS)
+
+
+paginated_rows = paginate(keyset=["rank", "id"], keyset_model=_Row, max_size=5)(_page)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_forward():
+    first_page = await paginated_rows(first=3)
+
+    assert [edge["node"]["rank"] for edge in first_page["edges"]] == [1, 2, 3]
+    assert first_page["page_info"]["has_next_page"] is True
+    assert first_page["page_info"]["has_previous_page"] is False
+
+    second_page = await paginated_rows(first=3, after=first_page["page_info"]["end_cursor"])
+
+    assert [edge["node"]["rank"] for edge in second_page["edges"]] == [4, 5, 6]
+    assert second_page["page_info"]["has_previous_page"] is True
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_backward():
+    page = await paginated_rows(last=2, before=get_relay_keyset_cursor([5, ROWS[4]["id"]]))
+
+    assert [edge["node"]["rank"] for edge in page["edges"]] == [3, 4]
+    assert page["page_info"]["has_previous_page"] is True
+
+
+@pytest.mark.asyncio
+async def test_keyset_cursor_values_are_coerced():
+    received = []
+
+    async def page(pagination_dto: KeysetPaginationInfoDto):
+        received.append(pagination_dto.values)
+        return [], 0
+
+    await paginate(keyset=["rank", "id"], keyset_model=_Row)(page)(after=get_relay_keyset_cursor([3, ROWS[2]["id"]]))
+
+    assert received == [(3, ROWS[2]["id"])]
+    assert isinstance(received[0][1], UUID)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        get_relay_keyset_cursor([1]),
+        get_relay_keyset_cursor(["first", "not-a-uuid"]),
+        get_relay_keyset_cursor([1, "not-a-uuid"]),
+    ],
+)
+async def test_invalid_keyset_cursor_is_a_bad_user_input(cursor):
+    with pytest.raises(BadUserInputError):
+        await paginated_rows(first=3, after=cursor)
+
+
+class _Document(Base):
+    __tablename__ = "keyset_pagination_test_document"
+
+    id = Column(Uuid(), primary_key=True)
+    rank = Column(Integer())
+
+
+def test_build_keyset_pagination_seeks_past_the_cursor():
+    dto = KeysetPaginationInfoDto(limit=10, keys=("rank", "id"), values=(3, str(ROWS[2]["id"])))
+
+    stmt = KeysetPaginationMixin().build_keyset_pagination(_Document, select(_Document), dto)
+    sql = str(stmt.compile())
+
+    assert "(keyset_pagination_test_document.rank, keyset_pagination_test_document.id) >" in sql
+    assert "ORDER BY keyset_pagination_test_document.rank ASC, keyset_pagination_test_document.id ASC" in sql
+    assert stmt._limit == 11
+
+
+def test_build_keyset_pagination_rejects_mistyped_cursor_values():
+    dto = KeysetPaginationInfoDto(limit=10, keys=("rank", "id"), values=("first", "not-a-uuid"))
+
+    with pytest.raises(BadUserInputError):
+        KeysetPaginationMixin().build_keyset_pagination(_Document, select(_Document), dto)
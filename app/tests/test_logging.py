@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+import pytest
+
+from app.core.logging import ContextQueueHandler, Formatter, RateLimitFilter, _fast_json_dumps, log_context
+
+
+def _record(msg, *args):
+    return logging.LogRecord("test", logging.INFO, __file__, 10, msg, args or None, None)
+
+
+def test_rate_limit_accepts_dict_messages():
+    rate_limit = RateLimitFilter(burst=2)
+
+    passed = [rate_limit.filter(_record({"event": "retry", "attempt": attempt})) for attempt in range(4)]
+
+    assert passed == [True, True, False, False]
+
+
+def test_rate_limit_keys_on_the_message_template():
+    rate_limit = RateLimitFilter(burst=1)
+
+    assert rate_limit.filter(_record("user %s logged in", "a"))
+    assert not rate_limit.filter(_record("user %s logged in", "b"))
+    assert rate_limit.filter(_record("user %s logged out", "a"))
+
+
+def _synchronous_line(record: logging.LogRecord) -> dict:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(Formatter())
+    handler.handle(record)
+    return json.loads(stream.getvalue())
+
+
+def _asynchronous_line(record: logging.LogRecord) -> dict:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(Formatter(json_serializer=_fast_json_dumps))
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    ContextQueueHandler(log_queue).handle(record)
+    listener.stop()
+    return json.loads(stream.getvalue())
+
+
+@pytest.mark.parametrize(
+    "msg, args",
+    [
+        ("plain message", ()),
+        ("user %s has %d items", ("ada", 3)),
+        ({"event": "payment", "amount": 12}, ()),
+    ],
+)
+def test_asynchronous_mode_writes_the_same_line(msg, args):
+    with log_context("correlation", 2, {"service": "api"}):
+        expected = _synchronous_line(_record(msg, *args))
+        line = _asynchronous_line(_record(msg, *args))
+
+    del expected["timestamp"], line["timestamp"]
+    assert line == expected
+    assert line["correlation_id"] == "correlation"
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from app.core.pagination import get_relay_node_cursor, paginate
+
+NODES = [{"id": index} for index in range(1, 6)]
+
+
+async def _page(pagination_dto):
+    return NODES[pagination_dto.offset : pagination_dto.offset + pagination_dto.limit], len(NODES)
+
+
+paginated_nodes = paginate(max_size=3, default_size=3)(_page)
+
+
+@pytest.mark.asyncio
+async def test_connection_builds_edges_on_first_read():
+    connection = await paginated_nodes(first=2)
+
+    assert "edges" not in dict.keys(connection)
+    assert connection.get("edges") == [
+        {"node": {"id": 1}, "cursor": get_relay_node_cursor(1)},
+        {"node": {"id": 2}, "cursor": get_relay_node_cursor(2)},
+    ]
+    assert "page_info" not in dict.keys(connection)
+
+
+@pytest.mark.asyncio
+async def test_connection_is_a_complete_dict():
+    connection = await paginated_nodes(first=2, after=get_relay_node_cursor(1))
+
+    assert isinstance(connection, dict)
+    assert json.loads(json.dumps(connection)) == {
+        "edges": [
+            {"node": {"id": 2}, "cursor": get_relay_node_cursor(2)},
+            {"node": {"id": 3}, "cursor": get_relay_node_cursor(3)},
+        ],
+        "nodes": [{"id": 2}, {"id": 3}],
+        "page_info": {
+            "has_next_page": True,
+            "has_previous_page": True,
+            "start_cursor": get_relay_node_cursor(2),
+            "end_cursor": get_relay_node_cursor(3),
+        },
+        "total_count": 5,
+    }
+    assert dict(connection) == connection
+
+
+@pytest.mark.asyncio
+async def test_connection_keys_can_be_replaced_and_removed():
+    connection = await paginated_nodes(first=2)
+
+    connection["edges"] = []
+    del connection["page_info"]
+
+    assert connection["edges"] == []
+    assert connection.get("page_info") is None
+    assert set(connection) == {"edges", "nodes", "total_count"}
+
+
+@pytest.mark.asyncio
+async def test_connection_counts_and_tests_keys_without_building():
+    connection = await paginated_nodes(first=2)
+
+    assert len(connection) == 4
+    assert "edges" in connection and "other" not in connection
+    assert "edges" not in dict.keys(connection)
+
+
+@pytest.mark.asyncio
+async def test_connection_copies_and_comparisons_see_every_key():
+    connection, other = await paginated_nodes(first=2), await paginated_nodes(first=2)
+
+    assert connection == other and not connection != other
+    assert {**connection} == connection.copy() == (connection | {}) == ({} | connection) == dict(connection)
+    assert sorted(reversed(connection)) == ["edges", "nodes", "page_info", "total_count"]
+    assert "'page_info': " in repr(other)
+    assert connection.pop("edges") == other["edges"]
+
+
+@pytest.mark.asyncio
+async def test_response_class_that_is_not_a_typed_dict_is_called():
+    class Response(dict):
+        pass
+
+    paginated = paginate(response_class=Response)(_page)  # type: ignore
+
+    response = await paginated(first=1)
+
+    assert type(response) is Response
+    assert response["edges"] == [{"node": {"id": 1}, "cursor": get_relay_node_cursor(1)}]
@@ -0,0 +1,124 @@
+from typing import Any, Dict, List
+
+import pytest
+from graphql import build_schema, get_introspection_query, parse, specified_rules, validate
+
+from app.core import ms_config
+from app.graphql.query_cost import query_cost_validator
+
+SCHEMA = build_schema(
+    """
+    directive @cost(complexity: Int, multipliers: [String!]) on FIELD_DEFINITION
+
+    type Query {
+        items(first: Int, last: Int): ItemConnection
+        report(pages: Int): Report @cost(complexity: 10, multipliers: ["pages"])
+    }
+
+    type ItemConnection {
+        nodes: [Item!]!
+    }
+
+    type Item {
+        name: String
+        parent: Item
+    }
+
+    type Report {
+        title: String
+    }
+    """
+)
+
+
+def _validate(query: str, variables: Dict[str, Any] | None = None):
+    context: Dict[str, Any] = {}
+    rules = query_cost_validator(context, parse(query), {"variables": variables})
+    errors = validate(SCHEMA, parse(query), [*specified_rules, *rules])
+    return errors, context["query_cost"]
+
+
+def _codes(errors) -> List[Any]:
+    return [(error.extensions or {}).get("code") for error in errors]
+
+
+def _nested(field: str, levels: int, leaf: str) -> str:
+    return f"{field} {{ " * levels + leaf + " }" * levels
+
+
+def test_connection_cost_is_multiplied_by_page_size():
+    errors, cost = _validate("{ items(first: 30) { nodes { parent { name } } } }")
+
+    assert errors == []
+    assert cost.cost == 1 + 30 * (1 + 1)
+    assert cost.depth == 4
+
+
+def test_cost_directive_complexity_and_multipliers():
+    errors, cost = _validate("query($pages: Int) { report(pages: $pages) { title } }", {"pages": 4})
+
+    assert errors == []
+    assert cost.cost == 10
+
+
+def test_cost_directive_is_not_accepted_in_operations():
+    errors, _ = _validate("{ report @cost(complexity: 0) { title } }")
+
+    assert [error.message for error in errors] == ["Directive '@cost' may not be used on field."]
+
+
+def test_expensive_connection_is_rejected():
+    size = ms_config.graphql.max_query_cost
+    errors, _ = _validate(f"{{ items(first: {size}) {{ nodes {{ parent {{ name }} }} }} }}")
+
+    assert _codes(errors) == ["QUERY_TOO_COMPLEX"]
+    assert "maximum cost" in errors[0].message
+
+
+def test_deep_query_is_rejected():
+    query = "{ items { nodes { " + _nested("parent", ms_config.graphql.max_query_depth, "name") + " } } }"
+    errors, cost = _validate(query)
+
+    assert _codes(errors) == ["QUERY_TOO_COMPLEX"]
+    assert cost.depth > ms_config.graphql.max_query_depth
+
+
+def test_nested_introspection_counts_toward_depth():
+    query = "{ __schema { types { fields { type { " + _nested("ofType", 40, "name") + " } } } } }"
+    errors, cost = _validate(query)
+
+    assert _codes(errors) == ["QUERY_TOO_COMPLEX"]
+    assert cost.depth > 40
+
+
+def test_standard_introspection_query_is_allowed():
+    errors, _ = _validate(get_introspection_query(descriptions=True))
+
+    assert errors == []
+
+
+def test_wide_query_of_aliased_leaves_is_rejected():
+    aliases = " ".join(f"a{index}: __typename" for index in range(5000))
+    errors, cost = _validate(f"{{ {aliases} }}")
+
+    assert _codes(errors) == ["QUERY_TOO_COMPLEX"]
+    assert "fields" in errors[0].message
+    assert cost.fields > ms_config.graphql.max_query_fields
+
+
+@pytest.mark.asyncio
+async def test_graphql_endpoint_rejects_too_complex_queries(client):
+    aliases = " ".join(f"a{index}: __typename" for index in range(5000))
+
+    response = await client.post("/graphql", json={"query": f"{{ {aliases} }}"})
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+
+
+@pytest.mark.asyncio
+async def test_graphql_endpoint_reports_query_cost(client):
+    response = await client.post("/graphql", json={"query": "{ testQuery }"})
+
+    assert response.status_code == 200
+    assert response.json()["extensions"]["cost"]["requestedQueryCost"] == 0
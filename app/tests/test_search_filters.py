@@ -0,0 +1,76 @@
+from enum import Enum
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.alembic.helpers import full_text_index, trigram_index
+from app.models.search_filter_mixin import SearchFilterMixin
+from app.models.types import SearchMode, SQLGenericSearch
+
+DIALECT = postgresql.dialect()
+
+BOOK = Table("book", MetaData(), Column("id", Integer(), primary_key=True), Column("title", String()))
+
+
+class _Book:
+    title = BOOK.c.title
+
+
+class _Field(Enum):
+    title = "title"
+
+
+def _sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=DIALECT, compile_kwargs={"literal_binds": True})).split())
+
+
+def _search(*search: SQLGenericSearch[_Field]) -> str:
+    stmt = SearchFilterMixin().build_search_filters(_Book, select(BOOK.c.id), search)  # type: ignore
+    return _sql(stmt).removeprefix("SELECT book.id FROM book ")
+
+
+@pytest.mark.parametrize(
+    "search, where",
+    [
+        (SQLGenericSearch(field=_Field.title, value="dune"), "WHERE book.title = 'dune'"),
+        (SQLGenericSearch(field=_Field.title, value="dune", use_ilike=True), "WHERE book.title ILIKE '%%dune%%'"),
+        (SQLGenericSearch(field=_Field.title, value="dune", mode=SearchMode.trigram), "WHERE book.title %%> 'dune'"),
+        (
+            SQLGenericSearch(field=_Field.title, value="dune", mode=SearchMode.full_text),
+            "WHERE to_tsvector('simple'::regconfig, book.title) @@ "
+            "websearch_to_tsquery('simple'::regconfig, 'dune')",
+        ),
+    ],
+)
+def test_search_modes(search, where):
+    assert _search(search) == where
+
+
+def test_ranked_searches_are_ordered_by_the_sum_of_their_ranks():
+    sql = _search(
+        SQLGenericSearch(field=_Field.title, value="dune", mode=SearchMode.full_text, rank=True),
+        SQLGenericSearch(field=_Field.title, value="arrakis", mode=SearchMode.trigram, rank=True),
+    )
+
+    assert sql.endswith(
+        "ORDER BY ts_rank(to_tsvector('simple'::regconfig, book.title), "
+        "websearch_to_tsquery('simple'::regconfig, 'dune')) + word_similarity('arrakis', book.title) DESC"
+    )
+
+
+def test_unranked_searches_keep_the_order():
+    assert "ORDER BY" not in _search(SQLGenericSearch(field=_Field.title, value="dune", mode=SearchMode.trigram))
+
+
+def test_indexes_match_the_filter_expressions():
+    table = Table("book", MetaData(), Column("title", String()))
+    table.append_constraint(trigram_index("book_title_trgm", "title"))
+    table.append_constraint(full_text_index("book_title_fts", "title"))
+    trigram, full_text = sorted(table.indexes, key=lambda index: index.name or "", reverse=True)
+
+    assert _sql(CreateIndex(trigram)) == "CREATE INDEX book_title_trgm ON book USING gin (title gin_trgm_ops)"
+    assert _sql(CreateIndex(full_text)) == (
+        "CREATE INDEX book_title_fts ON book USING gin (to_tsvector('simple'::regconfig, title))"
+    )
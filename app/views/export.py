@@ -0,0 +1,116 @@
+import csv
+import io
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Sequence
+
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select
+from starlette.types import Receive, Scope, Send
+
+from app.core.db import Session
+from app.core.encryptions import get_jwt_service
+from app.core.exceptions import UnauthorizedError
+from app.repositories.base_sql_repository import SqlBaseRepository
+
+ExportQuery = Callable[[], Select[Any]]
+ExportPermission = Callable[[Dict[str, Any]], bool]
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+_MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv; charset=utf-8"}
+
+
+@dataclass
+class _Export:
+    query: ExportQuery
+    is_allowed: ExportPermission
+
+
+router = APIRouter()
+repository = SqlBaseRepository(db=Session)
+_exports: Dict[str, _Export] = {}
+
+
+def register_export(name: str, query: ExportQuery, is_allowed: ExportPermission):
+    """`query` builds the statement on every export; it must select columns, e.g. `select(*Model.__table__.c)`,
+    rather than ORM entities. `is_allowed` receives the verified JWT payload of the caller."""
+    _exports[name] = _Export(query, is_allowed)
+
+
+def _token_payload(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401)
+    try:
+        return get_jwt_service().verify(token)
+    except UnauthorizedError:
+        raise HTTPException(status_code=401)
+
+
+class _ExportResponse(StreamingResponse):
+    """Starlette leaves an unfinished body iterator to the garbage collector, which would hold the database
+    session open; here the body and the row stream are closed as soon as the response ends or the client leaves."""
+
+    def __init__(self, content: AsyncGenerator[Any, None], chunks: AsyncGenerator[Any, None], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.iterators = (content, chunks)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                for iterator in self.iterators:
+                    await iterator.aclose()
+
+
+async def _ndjson_lines(chunks: AsyncGenerator[Sequence[Any], None]) -> AsyncGenerator[bytes, None]:
+    async for chunk in chunks:
+        yield b"".join(to_json(row._asdict()) + b"\n" for row in chunk)
+
+
+async def _csv_lines(columns: List[str], chunks: AsyncGenerator[Sequence[Any], None]) -> AsyncGenerator[str, None]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+@router.get("/{name}")
+async def export(
+    name: str,
+    format: ExportFormat = ExportFormat.ndjson,
+    fetch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    payload: Dict[str, Any] = Depends(_token_payload),
+):
+    registered = _exports.get(name)
+    if registered is None:
+        raise HTTPException(status_code=404)
+    if not registered.is_allowed(payload):
+        raise HTTPException(status_code=403)
+
+    stmt = registered.query()
+    chunks = repository.stream_chunks(stmt, fetch_size)
+    if format == ExportFormat.csv:
+        body = _csv_lines(list(stmt.selected_columns.keys()), chunks)
+    else:
+        body = _ndjson_lines(chunks)
+    return _ExportResponse(
+        body,
+        chunks,
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
@@ -1,4 +1,7 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.readiness import readiness_monitor
 
 router = APIRouter()
 
@@ -6,3 +9,9 @@ router = APIRouter()
 @router.get("")
 async def health_check():
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness():
+    ready, report = readiness_monitor.report()
+    return JSONResponse(report, status_code=200 if ready else 503)
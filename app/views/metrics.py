@@ -0,0 +1,23 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.db import engine
+from app.core.encryptions import password_hashing_gauges
+from app.core.metrics import Gauge, metrics_registry, process_gauges
+from app.core.pool import pool_statistics
+
+router = APIRouter()
+
+
+def collect_gauges() -> List[Gauge]:
+    gauges = process_gauges() + password_hashing_gauges()
+    for name, value in pool_statistics(engine).items():
+        gauges.append((f"db_pool_{name}", "gauge", {}, float(value)))
+    return gauges
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(collect_gauges()), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,103 @@
+import logging
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, Dict, List
+
+from httpx import ASGITransport, AsyncClient, Request, Response
+from pydantic import BaseModel
+from sqlalchemy import String, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.logging import Formatter, log_context
+from app.core.page_info import generate_pagination_dto
+from app.core.pagination import get_relay_node_cursor, paginate
+from app.graphql.client import GraphQLClient
+from app.models.base_model import Base
+from app.models.search_filter_mixin import SearchFilterMixin
+from app.models.types import SearchMode, SQLGenericSearch
+from benchmarks.runner import benchmark
+
+
+class _Document(Base):
+    __tablename__ = "benchmark_document"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String)
+    body: Mapped[str] = mapped_column(String)
+
+
+class _DocumentField(Enum):
+    title = "title"
+    body = "body"
+
+
+class _Item(BaseModel):
+    id: int
+    name: str
+    tags: List[str]
+
+
+class _Items(BaseModel):
+    items: List[_Item]
+
+
+@benchmark("generate_pagination_dto")
+@asynccontextmanager
+async def pagination_dto():
+    yield lambda: generate_pagination_dto(20, 100, None, 20, before=141, after=None)
+
+
+@benchmark("paginate")
+@asynccontextmanager
+async def paginate_page():
+    nodes = [{"id": index, "name": f"node {index}"} for index in range(50)]
+
+    async def page(pagination_dto: Any):
+        return nodes, 10_000
+
+    paginated: Any = paginate(max_size=50, default_size=50)(page)
+    after = get_relay_node_cursor(100)
+    yield lambda: paginated(first=50, after=after)
+
+
+@benchmark("build_search_filters")
+@asynccontextmanager
+async def search_filters():
+    mixin = SearchFilterMixin()
+    search = [
+        SQLGenericSearch[_DocumentField](
+            field=_DocumentField.title, value="report", mode=SearchMode.trigram, rank=True
+        ),
+        SQLGenericSearch[_DocumentField](field=_DocumentField.body, value="q3 revenue", mode=SearchMode.full_text),
+        SQLGenericSearch[_DocumentField](field=_DocumentField.title, value="draft", use_ilike=True),
+    ]
+    yield lambda: mixin.build_search_filters(_Document, select(_Document), search)
+
+
+@benchmark("formatter_add_fields")
+@asynccontextmanager
+async def formatter_add_fields():
+    formatter = Formatter()
+    record = logging.LogRecord("default", logging.INFO, __file__, 1, "user %s logged in", ("42",), None)
+    with log_context("5f0c1d7e-4b6a-4c36-9a52-1e6f6f1d2b3c", 3, {"user_id": "42"}):
+        yield lambda: formatter.add_fields({}, record, {})
+
+
+@benchmark("graphql_client_handle_response")
+@asynccontextmanager
+async def graphql_client_handle_response():
+    client = GraphQLClient[_Items]()
+    body: Dict[str, Any] = {
+        "data": {"items": [{"id": index, "name": f"item {index}", "tags": ["a", "b"]} for index in range(50)]}
+    }
+    response = Response(200, json=body, request=Request("POST", "http://gateway/v2/graphql"))
+    yield lambda: client._handle_response(response, _Items)
+
+
+@benchmark("graphql_request")
+@asynccontextmanager
+async def graphql_request():
+    from main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost") as client:
+        yield lambda: client.post("/graphql/", json={"query": "query Benchmark { __typename }"})
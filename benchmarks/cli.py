@@ -0,0 +1,124 @@
+import asyncio
+import json
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from dotenv import load_dotenv
+
+from benchmarks.load_test import load_operations, run_load, running_stack
+from benchmarks.runner import (
+    BASELINES_DIRECTORY,
+    find_regressions,
+    load_results,
+    registry,
+    run_benchmarks,
+    save_results,
+)
+
+app = typer.Typer(help="Micro-benchmarks of the service hot paths.")
+
+
+def _load_cases():
+    # The cases import the application, which reads its configuration from the environment.
+    load_dotenv(dotenv_path=".env", override=True)
+    import_module("benchmarks.cases")
+
+
+def _parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, _, threshold = value.partition("=")
+        thresholds[name] = float(threshold)
+    return thresholds
+
+
+def _report(baseline: dict, current: dict, threshold: float, thresholds: Dict[str, float]) -> bool:
+    regressions = {
+        regression.name: regression for regression in find_regressions(baseline, current, threshold, thresholds)
+    }
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        change = "" if reference is None else f"{result['median_us'] / reference['median_us'] - 1:+.1%}"
+        status = "REGRESSION" if name in regressions else ""
+        typer.echo(f"{name:<36} {result['median_us']:>12.2f}us {change:>8} {status}")
+    return not regressions
+
+
+@app.command()
+def run(
+    only: List[str] = typer.Option([], "--only", help="Benchmarks to run, all by default."),
+    rounds: int = typer.Option(7, help="Timed rounds per benchmark."),
+    min_round_seconds: float = typer.Option(0.1, help="Minimum duration of a round."),
+    save_baseline: Optional[str] = typer.Option(None, help="Store the results as this baseline."),
+    compare: Optional[str] = typer.Option(None, help="Compare the results with this baseline."),
+    output: Optional[Path] = typer.Option(None, help="Also write the results to this file."),
+    threshold: float = typer.Option(0.1, help="Allowed slowdown of the median, 0.1 is 10%."),
+    threshold_for: List[str] = typer.Option([], "--threshold-for", help="Per benchmark threshold, as name=0.2."),
+):
+    _load_cases()
+
+    names = only or list(registry)
+    unknown = set(names) - set(registry)
+    if unknown:
+        raise typer.BadParameter(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run_benchmarks(names, rounds, min_round_seconds))
+    if output is not None:
+        save_results(output, results)
+    if save_baseline is not None:
+        save_results(BASELINES_DIRECTORY / f"{save_baseline}.json", results)
+
+    baseline = {"benchmarks": {}}
+    if compare is not None:
+        baseline = load_results(BASELINES_DIRECTORY / f"{compare}.json")
+    if not _report(baseline, results, threshold, _parse_thresholds(threshold_for)):
+        raise typer.Exit(code=1)
+
+
+@app.command("compare")
+def compare_results(
+    baseline: Path,
+    current: Path,
+    threshold: float = typer.Option(0.1, help="Allowed slowdown of the median, 0.1 is 10%."),
+    threshold_for: List[str] = typer.Option([], "--threshold-for", help="Per benchmark threshold, as name=0.2."),
+):
+    if not _report(load_results(baseline), load_results(current), threshold, _parse_thresholds(threshold_for)):
+        raise typer.Exit(code=1)
+
+
+@app.command("list")
+def list_benchmarks():
+    _load_cases()
+
+    for name in registry:
+        typer.echo(name)
+
+
+@app.command()
+def load(
+    operations: Path = typer.Option(Path(__file__).parent / "operations" / "example.json", help="Operation mix."),
+    rate: float = typer.Option(100.0, help="Target requests per second."),
+    duration: float = typer.Option(30.0, help="Seconds of load."),
+    workers: int = typer.Option(1, help="Uvicorn worker processes."),
+    gateway_latency_ms: float = typer.Option(20.0, help="Mean latency of the fake gateway."),
+    gateway_jitter_ms: float = typer.Option(5.0, help="Standard deviation of the fake gateway latency."),
+    gateway_responses: Optional[Path] = typer.Option(
+        None, help="JSON object of the fake gateway data by operation name, {'__typename': 'Query'} otherwise."
+    ),
+    max_in_flight: int = typer.Option(512, help="Concurrent requests before new ones are dropped."),
+    seed: Optional[int] = typer.Option(None, help="Seed of the operation picker."),
+    output: Optional[Path] = typer.Option(None, help="Also write the report to this file."),
+):
+    """Runs main.app under uvicorn against the configured Postgres and a fake gateway, then replays an operation mix."""
+    load_dotenv(dotenv_path=".env", override=True)
+    mix = load_operations(operations)
+    responses = None if gateway_responses is None else json.loads(gateway_responses.read_text())
+    with running_stack(workers, gateway_latency_ms, gateway_jitter_ms, responses) as url:
+        result = asyncio.run(run_load(url, mix, rate, duration, max_in_flight, seed))
+
+    report = json.dumps(result.report(), indent=2)
+    if output is not None:
+        output.write_text(report + "\n")
+    typer.echo(report)
@@ -0,0 +1,40 @@
+import asyncio
+import json
+import os
+import random
+import re
+from typing import Any, Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Stand-in for the GraphQL gateway, configured through the environment by the load-test harness.
+LATENCY_SECONDS = float(os.environ.get("FAKE_GATEWAY_LATENCY_MS", "20")) / 1000
+JITTER_SECONDS = float(os.environ.get("FAKE_GATEWAY_JITTER_MS", "5")) / 1000
+RESPONSES: Dict[str, Any] = json.loads(os.environ.get("FAKE_GATEWAY_RESPONSES", "{}"))
+OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+
+def _operation_name(body: Dict[str, Any]) -> str:
+    # GraphQLClient does not send operationName, the name is then taken from the document.
+    if body.get("operationName"):
+        return body["operationName"]
+    match = OPERATION_NAME.match(body.get("query") or "")
+    return match.group(1) if match else ""
+
+
+def _answer(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {"data": RESPONSES.get(_operation_name(body), {"__typename": "Query"})}
+
+
+async def graphql(request: Request) -> JSONResponse:
+    body = await request.json()
+    await asyncio.sleep(max(0.0, random.gauss(LATENCY_SECONDS, JITTER_SECONDS)))
+    if isinstance(body, list):
+        return JSONResponse([_answer(item) for item in body])
+    return JSONResponse(_answer(body))
+
+
+app = Starlette(routes=[Route("/v2/graphql", graphql, methods=["POST"])])
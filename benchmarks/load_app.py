@@ -0,0 +1,18 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, ConfigDict
+
+from app.graphql.client import GraphQLBody, GraphQLClient
+from main import app
+
+
+class GatewayData(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+# The schema has no field backed by the gateway yet, this route sends the posted operation through GraphQLClient so
+# the load test covers its connection pool, batching and cache behind the same middleware as /graphql/.
+@app.post("/load-test/gateway")
+async def gateway(body: GraphQLBody) -> Dict[str, Any]:
+    response = await GraphQLClient[GatewayData]().run(body, GatewayData)
+    return {"data": response.data.model_dump()}
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+ROOT_DIRECTORY = Path(__file__).parent.parent
+
+
+@dataclass
+class Operation:
+    name: str
+    query: str
+    weight: float = 1.0
+    variables: Optional[Dict[str, Any]] = None
+    operation_name: Optional[str] = None
+    path: str = "/graphql/"
+
+    def body(self) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"query": self.query}
+        if self.variables is not None:
+            body["variables"] = self.variables
+        if self.operation_name is not None:
+            body["operationName"] = self.operation_name
+        return body
+
+
+@dataclass
+class PoolSaturation:
+    max_checked_out: float = 0.0
+    capacity: float = 0.0
+    max_waiting: float = 0.0
+    timeouts: float = 0.0
+
+    def observe(self, gauges: Dict[str, List[float]]):
+        checked_out = sum(gauges.get("db_pool_checked_out", []))
+        self.max_checked_out = max(self.max_checked_out, checked_out)
+        self.capacity = max(
+            self.capacity, sum(gauges.get("db_pool_size", [])) + sum(gauges.get("db_pool_max_overflow", []))
+        )
+        self.max_waiting = max(self.max_waiting, sum(gauges.get("db_pool_waiting", [])))
+        self.timeouts = max(self.timeouts, sum(gauges.get("db_pool_timeouts", [])))
+
+
+@dataclass
+class LoadTestResult:
+    duration: float
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    dropped: int = 0
+    pool: PoolSaturation = field(default_factory=PoolSaturation)
+
+    def report(self) -> Dict[str, Any]:
+        every = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            **_summary(every, sum(self.errors.values()), self.duration),
+            "dropped": self.dropped,
+            "operations": {
+                name: _summary(latencies, self.errors[name], self.duration)
+                for name, latencies in self.latencies.items()
+            },
+            "pool": {
+                **vars(self.pool),
+                "saturation": self.pool.max_checked_out / self.pool.capacity if self.pool.capacity else None,
+            },
+        }
+
+
+def _percentile(ordered: List[float], percentile: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))]
+
+
+def _summary(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": len(ordered) / duration if duration else 0.0,
+        "error_rate": errors / len(ordered) if ordered else 0.0,
+        **{f"p{percentile}_ms": _milliseconds(_percentile(ordered, percentile)) for percentile in (50, 95, 99)},
+    }
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def load_operations(path: Path) -> List[Operation]:
+    return [Operation(**operation) for operation in json.loads(path.read_text())]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise TimeoutError(f"{url} did not start within {timeout}s")
+
+
+@contextmanager
+def _uvicorn(app: str, port: int, env: Dict[str, str], cwd: Path, workers: int = 1) -> Iterator[str]:
+    command = [sys.executable, "-m", "uvicorn", app, "--app-dir", str(ROOT_DIRECTORY), "--port", str(port)]
+    process = subprocess.Popen(
+        [*command, "--workers", str(workers), "--log-level", "warning"], env={**os.environ, **env}, cwd=cwd
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(url, process)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@contextmanager
+def running_stack(
+    workers: int,
+    gateway_latency_ms: float,
+    gateway_jitter_ms: float,
+    gateway_responses: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Starts the fake gateway and main.app under uvicorn, the database settings come from the environment.
+
+    The servers run in an empty working directory, so main.py finds no `.env` that would override the gateway URL.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        working_directory = Path(directory)
+        metrics_directory = working_directory / "metrics"
+        metrics_directory.mkdir()
+        gateway_env = {
+            "FAKE_GATEWAY_LATENCY_MS": str(gateway_latency_ms),
+            "FAKE_GATEWAY_JITTER_MS": str(gateway_jitter_ms),
+            "FAKE_GATEWAY_RESPONSES": json.dumps(gateway_responses or {}),
+        }
+        with _uvicorn("benchmarks.fake_gateway:app", _free_port(), gateway_env, working_directory) as gateway_url:
+            app_env = {"GRAPHQL_GATEWAY_URL": gateway_url, "METRICS_MULTIPROCESS_DIR": str(metrics_directory)}
+            with _uvicorn("benchmarks.load_app:app", _free_port(), app_env, working_directory, workers) as app_url:
+                yield app_url
+
+
+def _parse_gauges(text: str) -> Dict[str, List[float]]:
+    gauges: Dict[str, List[float]] = defaultdict(list)
+    for line in text.splitlines():
+        if line.startswith("db_pool_"):
+            name_and_labels, _, value = line.rpartition(" ")
+            gauges[name_and_labels.split("{")[0]].append(float(value))
+    return gauges
+
+
+async def _watch_pool(client: httpx.AsyncClient, pool: PoolSaturation, interval: float):
+    while True:
+        try:
+            pool.observe(_parse_gauges((await client.get("/metrics")).text))
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def _send(client: httpx.AsyncClient, operation: Operation, result: LoadTestResult, slots: asyncio.Semaphore):
+    started = perf_counter()
+    try:
+        response = await client.post(operation.path, json=operation.body())
+        failed = response.status_code != 200 or bool(response.json().get("errors"))
+    except (httpx.HTTPError, ValueError):
+        failed = True
+    finally:
+        slots.release()
+    result.latencies[operation.name].append(perf_counter() - started)
+    if failed:
+        result.errors[operation.name] += 1
+
+
+async def run_load(
+    url: str,
+    operations: List[Operation],
+    rate: float,
+    duration: float,
+    max_in_flight: int = 512,
+    seed: Optional[int] = None,
+) -> LoadTestResult:
+    """Open-loop load: requests start on schedule, those that would exceed `max_in_flight` are counted as dropped."""
+    picker = random.Random(seed)
+    weights = [operation.weight for operation in operations]
+    result = LoadTestResult(duration=duration)
+    slots = asyncio.Semaphore(max_in_flight)
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        watcher = asyncio.create_task(_watch_pool(client, result.pool, 0.5))
+        tasks = []
+        started = perf_counter()
+        for index in range(int(rate * duration)):
+            delay = started + index / rate - perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if slots.locked():
+                result.dropped += 1
+                continue
+            await slots.acquire()
+            operation = picker.choices(operations, weights)[0]
+            tasks.append(asyncio.create_task(_send(client, operation, result, slots)))
+        await asyncio.gather(*tasks)
+        result.duration = perf_counter() - started
+        watcher.cancel()
+    return result
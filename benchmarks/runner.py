@@ -0,0 +1,105 @@
+import json
+import platform
+import statistics
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from inspect import isawaitable
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINES_DIRECTORY = Path(__file__).parent / "baselines"
+
+Case = Callable[[], AbstractAsyncContextManager[Callable[[], Any]]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    case: Case
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline_us: float
+    current_us: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_us / self.baseline_us
+
+
+registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Case], Case]:
+    """Registers an async context manager factory yielding the operation to time, sync or async."""
+
+    def register(case: Case) -> Case:
+        registry[name] = Benchmark(name, case)
+        return case
+
+    return register
+
+
+async def _time(operation: Callable[[], Any], number: int) -> float:
+    start = perf_counter()
+    for _ in range(number):
+        result = operation()
+        if isawaitable(result):
+            await result
+    return perf_counter() - start
+
+
+async def measure(benchmark: Benchmark, rounds: int, min_round_seconds: float) -> Dict[str, Any]:
+    async with benchmark.case() as operation:
+        await _time(operation, 10)
+        number = 1
+        while (elapsed := await _time(operation, number)) < min_round_seconds and number < 1_000_000:
+            number = max(number * 2, int(number * min_round_seconds / max(elapsed, 1e-9)))
+        samples = [await _time(operation, number) / number * 1_000_000 for _ in range(rounds)]
+
+    return {
+        "median_us": statistics.median(samples),
+        "mean_us": statistics.fmean(samples),
+        "min_us": min(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": number,
+    }
+
+
+async def run_benchmarks(names: List[str], rounds: int, min_round_seconds: float) -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {name: await measure(registry[name], rounds, min_round_seconds) for name in names},
+    }
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def save_results(path: Path, results: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    thresholds: Optional[Dict[str, float]] = None,
+) -> List[Regression]:
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        allowed = (thresholds or {}).get(name, threshold)
+        if result["median_us"] > reference["median_us"] * (1 + allowed):
+            regressions.append(Regression(name, reference["median_us"], result["median_us"], allowed))
+    return regressions
@@ -1,46 +1,58 @@
+import asyncio
 import logging
-from typing import Any, Callable
+from contextlib import asynccontextmanager, suppress
 
 from ariadne.asgi import GraphQL
 from dotenv import load_dotenv
-from starlette.middleware.cors import CORSMiddleware
+
+from app.startup import run_shutdown_callbacks, startup_report
 
 load_dotenv(dotenv_path=".env", override=True)
 
-from fastapi import FastAPI, Request
-from starlette.types import ASGIApp, Receive, Scope, Send
+from fastapi import FastAPI
 
 from app.core import ms_config
+from app.core.asgi import RequestPipelineMiddleware
 from app.core.context import get_context_value
-from app.core.logging import ctx_correlation_id, ctx_step, log_context, logger
+from app.core.logging import QUIET_PATHS, AccessLogFilter, logger
+from app.core.metrics import flush_metrics_periodically, metrics_registry
+from app.core.readiness import readiness_monitor
+from app.graphql.client import close_gateway_client, get_gateway_client
+from app.graphql.document_cache import document_cache
 from app.graphql.http_handler import HTTPHandler
+from app.graphql.metrics_extension import MetricsExtension
+from app.graphql.query_cost import QueryCostExtension, query_cost_validator
 from app.graphql.schema import schema
+from app.views.export import router as export_router
 from app.views.health_check import router as health_check_router
+from app.views.metrics import collect_gauges
+from app.views.metrics import router as metrics_router
 
 
-class GraphQLRedirect:
-    def __init__(self, app: ASGIApp) -> None:
-        self.app = app
-
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope.get("path") in ("/graphql", "/v2/graphql", "/v2/graphql/"):
-            scope["path"] = "/graphql/"
-            scope["raw_path"] = b"/graphql/"
-        await self.app(scope, receive, send)
-
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    get_gateway_client()
+    logger.info("startup completed", extra=startup_report())
+    metrics_flusher = asyncio.create_task(
+        flush_metrics_periodically(ms_config.metrics.flush_interval_seconds, collect_gauges)
+    )
+    readiness_checker = asyncio.create_task(readiness_monitor.run())
+    yield
+    for task in (metrics_flusher, readiness_checker):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    metrics_registry.write_snapshot(collect_gauges())
+    await close_gateway_client()
+    await run_shutdown_callbacks()
 
-class LogFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        record_args = record.args
-        if isinstance(record_args, tuple):
-            return len(record_args) >= 3 and record_args[2] not in ["/health_check", "/graphql/"]
-        return False
 
-
-logging.getLogger("uvicorn.access").addFilter(LogFilter())
-app = FastAPI(title="app-core")
+# GraphQL requests are logged by the request pipeline with their metrics.
+logging.getLogger("uvicorn.access").addFilter(AccessLogFilter([*QUIET_PATHS, "/graphql/"]))
+app = FastAPI(title="app-core", lifespan=lifespan)
 app.add_middleware(
-    CORSMiddleware,
+    RequestPipelineMiddleware,
+    path_rewrites={path: "/graphql/" for path in ("/graphql", "/v2/graphql", "/v2/graphql/")},
     allow_origins=[
         "http://localhost:3000",
         "http://127.0.0.1:3000",
@@ -50,26 +62,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    quiet_paths=QUIET_PATHS,
 )
-app.add_middleware(GraphQLRedirect)
 app.mount(
     "/graphql",
     GraphQL(
         schema,
         context_value=get_context_value,
+        query_parser=document_cache.parse,
+        query_validator=document_cache.validate,
+        validation_rules=query_cost_validator,
         debug=ms_config.is_dev_environment(),
         logger=logger,
-        http_handler=HTTPHandler(),
+        http_handler=HTTPHandler(extensions=[QueryCostExtension, MetricsExtension]),
     ),
 )
 app.include_router(health_check_router, prefix="/health_check")
-
-@app.middleware("http")
-async def add_http_header_for_logging(request: Request, call_next: Callable[..., Any]):
-    correlation_id = request.headers.get("correlation_id") or "00000000-0000-4000-0000-000000000000"
-    step = int(request.headers.get("step") or 0)
-    with log_context(correlation_id, step):
-        response = await call_next(request)
-        response.headers.append("correlation_id", ctx_correlation_id.get())
-        response.headers.append("step", str(ctx_step.get()))
-        return response
\ No newline at end of file
+app.include_router(metrics_router, prefix="/metrics")
+app.include_router(export_router, prefix="/export")